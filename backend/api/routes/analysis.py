@@ -1,12 +1,43 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi.responses import ORJSONResponse
+from typing import Optional, Tuple
+from collections import OrderedDict
+import time
 import logging
 
 from models.schemas import AnalysisResponse, RiskLevel
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+# Small async-safe TTL/LRU cache so repeated polls for the same assessment
+# skip the (future) database round-trip.
+_CACHE_TTL = 60.0
+_CACHE_MAX = 1024
+_analysis_cache: "OrderedDict[str, Tuple[float, Optional[AnalysisResponse]]]" = OrderedDict()
+
+
+async def _load_analysis(assessment_id: str) -> Optional[AnalysisResponse]:
+    """
+    Load the latest analysis for an assessment, caching results for a short TTL.
+    NOTE: Placeholder without a real database.
+    """
+    now = time.monotonic()
+    cached = _analysis_cache.get(assessment_id)
+    if cached and cached[0] > now:
+        _analysis_cache.move_to_end(assessment_id)
+        return cached[1]
+
+
+    result = None
+
+    _analysis_cache[assessment_id] = (now + _CACHE_TTL, result)
+    _analysis_cache.move_to_end(assessment_id)
+    while len(_analysis_cache) > _CACHE_MAX:
+        _analysis_cache.popitem(last=False)
+    return result
 
 
 @router.get("/latest", response_model=Optional[AnalysisResponse])
@@ -16,8 +47,7 @@ async def get_latest_analysis(assessment_id: str = Query(..., description="Asses
     NOTE: Placeholder without a real database.
     """
 
-
-    return None
+    return await _load_analysis(assessment_id)
 
 
 @router.get("/by-id/{assessment_id}", response_model=Optional[AnalysisResponse])
@@ -28,6 +58,4 @@ async def get_analysis_by_id(assessment_id: str):
     """
 
     logger.info(f"Fetching analysis for assessment {assessment_id}")
-    return None
-
-
+    return await _load_analysis(assessment_id)
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
+from functools import lru_cache
+import asyncio
 import uuid
 from datetime import datetime
 import logging
@@ -11,11 +14,24 @@ from models.schemas import AssessmentCreate, AssessmentResponse
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-gpt_service = GPTService()
-sora_service = SoraService()
-storage_service = StorageService()
+
+# Singleton service getters: one client/connection pool per process,
+# created lazily on first use and shared across requests via Depends.
+@lru_cache(maxsize=1)
+def get_gpt_service() -> GPTService:
+    return GPTService()
+
+
+@lru_cache(maxsize=1)
+def get_sora_service() -> SoraService:
+    return SoraService()
+
+
+@lru_cache(maxsize=1)
+def get_storage_service() -> StorageService:
+    return StorageService()
 
 
 @router.post("/submit", response_model=AssessmentResponse)
@@ -47,23 +63,24 @@ async def submit_assessment(
 @router.post("/upload-photos/{assessment_id}")
 async def upload_photos(
     assessment_id: str,
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    storage_service: StorageService = Depends(get_storage_service)
 ):
 
 
     if not files:
         raise HTTPException(400, "No files provided")
 
-    uploaded_urls: List[str] = []
-
     for file in files:
         if not file.content_type or not file.content_type.startswith('image/'):
             raise HTTPException(400, "Only image files allowed")
 
-        filename = f"{assessment_id}/{uuid.uuid4()}.jpg"
-        url = await storage_service.upload_file(file, filename)
-        if url:
-            uploaded_urls.append(url)
+
+    results = await asyncio.gather(
+        *[storage_service.upload_file(file, f"{assessment_id}/{uuid.uuid4()}.jpg")
+          for file in files]
+    )
+    uploaded_urls: List[str] = [url for url in results if url]
 
     return {
         "assessment_id": assessment_id,
@@ -85,6 +102,9 @@ async def get_analysis_status(assessment_id: str):
 async def run_analysis(assessment_id: str, assessment_data: dict):
 
     try:
+        gpt_service = get_gpt_service()
+        sora_service = get_sora_service()
+
         gpt_result = await gpt_service.analyze_structural_damage(
             building_data=assessment_data,
             image_urls=assessment_data.get('photo_urls', [])
@@ -1,38 +1,223 @@
 
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Dict, Optional
-import json
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
+from typing import List, Dict
+import asyncio
 import os
+import shutil
+import subprocess
+import time
 import logging
+from secrets import token_hex
 from datetime import datetime
+import numpy as np
 
 from services.physics_simulation_service import PhysicsSimulationService
 from services.simulation_video_service import SimulationVideoService
 from services.paraview_service import ParaViewService
 from models.schemas import PhysicsSimulationRequest, PhysicsSimulationResponse
-import openai
-from dotenv import load_dotenv
+import aiofiles.os
 
-load_dotenv()
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+    logging.warning("PyAV not available - falling back to OpenCV software encoding")
+
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logging.warning("Numba not available - placeholder frames render with NumPy")
+
+
+def _fill_floor_rects_numpy(frame, y0s, y1s, x_left, x_right, colors):
+    """Paint the solid floor rectangles into the frame (NumPy path)"""
+    for i in range(y0s.shape[0]):
+        frame[y0s[i]:y1s[i], x_left:x_right] = colors[i]
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _fill_floor_rects(frame, y0s, y1s, x_left, x_right, colors):
+        for i in range(y0s.shape[0]):
+            for y in prange(y0s[i], y1s[i]):
+                for x in range(x_left, x_right):
+                    frame[y, x, 0] = colors[i, 0]
+                    frame[y, x, 1] = colors[i, 1]
+                    frame[y, x, 2] = colors[i, 2]
+
+    # Warm the JIT cache at import so the first request does not pay the
+    # compile cost; fall back to NumPy if compilation fails.
+    try:
+        _fill_floor_rects(np.zeros((2, 2, 3), dtype=np.uint8),
+                          np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.int64),
+                          0, 1, np.zeros((1, 3), dtype=np.uint8))
+    except Exception as e:
+        logging.warning(f"Numba kernel compilation failed, using NumPy path: {str(e)}")
+        _fill_floor_rects = _fill_floor_rects_numpy
+else:
+    _fill_floor_rects = _fill_floor_rects_numpy
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Service singletons are built once in main.py's lifespan (so e.g. the
+# AsyncOpenAI client binds to the running event loop) and resolved from
+# app.state via Depends.
+def get_physics_service(request: Request) -> PhysicsSimulationService:
+    return request.app.state.physics
+
+
+def get_video_service(request: Request) -> SimulationVideoService:
+    return request.app.state.video
+
+
+def get_paraview_service(request: Request) -> ParaViewService:
+    return request.app.state.paraview
+
+
+# The placeholder video never reads simulation_id, so it is rendered once
+# per parameter set into a content-addressed file and served for every id.
+# The preview variant is for the in-app player; full HD is kept for
+# explicit downloads.
+_PLACEHOLDER_PARAMS = (1920, 1080, 30, 10)
+_PREVIEW_PARAMS = (960, 540, 24, 6)
+
+
+def _placeholder_path(width: int, height: int, fps: int, secs: int) -> str:
+    return f"simulation_videos/placeholder_v1_{width}x{height}_{fps}fps_{secs}s.mp4"
+
+
+_PLACEHOLDER_PATH = _placeholder_path(*_PLACEHOLDER_PARAMS)
+_PREVIEW_PATH = _placeholder_path(*_PREVIEW_PARAMS)
+_placeholder_lock = asyncio.Lock()
 
-physics_service = PhysicsSimulationService()
-video_service = SimulationVideoService()
+# Cap concurrent simulation renders so background video generation cannot
+# monopolize the worker; a real job queue would replace this if the
+# deployment ever grows a Redis
+_render_semaphore = asyncio.Semaphore(2)
 
 
-openai_api_key = os.getenv("OPENAI_API_KEY")
-openai_client = openai.AsyncOpenAI(api_key=openai_api_key) if openai_api_key else None
+# One directory snapshot instead of a stat per video path: a single scandir
+# call covers every existence check for up to _SCAN_TTL seconds, and writers
+# in this module add their own filenames so new videos show up immediately.
+_VIDEO_DIR = "simulation_videos"
+_SCAN_TTL = 2.0
+_known_videos: set = set()
+_known_videos_expiry = 0.0
 
 
-paraview_service = ParaViewService(openai_client=openai_client)
+async def _video_exists(filename: str) -> bool:
+    """Membership test against a periodically refreshed directory snapshot"""
+    global _known_videos, _known_videos_expiry
+    now = time.monotonic()
+    if now >= _known_videos_expiry:
+        try:
+            _known_videos = {entry.name for entry in await aiofiles.os.scandir(_VIDEO_DIR)}
+        except FileNotFoundError:
+            _known_videos = set()
+        _known_videos_expiry = now + _SCAN_TTL
+    return filename in _known_videos
+
+
+# Stat results feed FileResponse (Content-Length/ETag); cache them briefly
+# so polling clients don't stat the same file on every request
+_STAT_TTL = 5.0
+_stat_cache: Dict[str, tuple] = {}
+
+
+async def _cached_stat(path: str) -> os.stat_result:
+    now = time.monotonic()
+    cached = _stat_cache.get(path)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    st = await aiofiles.os.stat(path)
+    if len(_stat_cache) > 1024:
+        _stat_cache.clear()
+    _stat_cache[path] = (now + _STAT_TTL, st)
+    return st
+
+
+# Probed once at import so requests never shell out to check for ffmpeg
+FFMPEG_PATH = shutil.which("ffmpeg")
+_ffmpeg_nvenc = None
+
+
+def _ffmpeg_codec_args() -> list:
+    """ffmpeg encoder flags: NVENC when the build has it, else libx264"""
+    global _ffmpeg_nvenc
+    if _ffmpeg_nvenc is None:
+        try:
+            encoders = subprocess.run(
+                [FFMPEG_PATH, "-hide_banner", "-encoders"],
+                capture_output=True, text=True, timeout=10
+            ).stdout
+            _ffmpeg_nvenc = "h264_nvenc" in encoders
+        except Exception:
+            _ffmpeg_nvenc = False
+    if _ffmpeg_nvenc:
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "ll",
+                "-rc", "vbr", "-cq", "23"]
+    return ["-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+            "-threads", "0"]
+
+
+class _FfmpegWriter:
+    """cv2.VideoWriter-compatible wrapper around an ffmpeg stdin pipe"""
+
+    def __init__(self, output_path: str, fps: int, width: int, height: int):
+        self.proc = subprocess.Popen(
+            [FFMPEG_PATH, "-y", "-loglevel", "error",
+             "-f", "rawvideo", "-pix_fmt", "bgr24",
+             "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+             *_ffmpeg_codec_args(),
+             "-pix_fmt", "yuv420p", output_path],
+            stdin=subprocess.PIPE
+        )
+
+    def isOpened(self) -> bool:
+        return self.proc.poll() is None
+
+    def write(self, frame):
+        # Hand ffmpeg the buffer directly; tobytes() would copy ~6 MB per
+        # frame. The render buffer is always C-contiguous.
+        self.proc.stdin.write(memoryview(np.ascontiguousarray(frame)))
+
+    def release(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+_video_codec = None
+
+def _pick_video_codec() -> str:
+    """Pick a hardware H.264 encoder if one is present, else software libx264"""
+    global _video_codec
+    if _video_codec is None:
+        for codec in ("h264_nvenc", "h264_vaapi", "h264_videotoolbox", "libx264"):
+            try:
+                av.codec.Codec(codec, "w")
+                _video_codec = codec
+                logger.info(f"Using video codec: {codec}")
+                break
+            except Exception:
+                continue
+    return _video_codec
 
 @router.post("/analyze", response_model=PhysicsSimulationResponse)
 async def analyze_structural_damage(
     request: PhysicsSimulationRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    req: Request,
+    physics_service: PhysicsSimulationService = Depends(get_physics_service),
+    video_service: SimulationVideoService = Depends(get_video_service)
 ):
     """
     Perform physics-based structural analysis with simulation
@@ -52,22 +237,9 @@ async def analyze_structural_damage(
         }
         
 
-        annotations_dict = [
-            {
-                "id": ann.id,
-                "position": ann.position,
-                "issueType": ann.issueType,
-                "description": ann.description,
-                "color": ann.color,
-                "timestamp": ann.timestamp
-            }
-            for ann in request.annotations
-        ]
+        annotations_dict = [ann.model_dump() for ann in request.annotations]
 
-        logger.info(f"Converted {len(annotations_dict)} annotations to dictionaries")
-        logger.info(f"First annotation type: {type(annotations_dict[0]) if annotations_dict else 'None'}")
-        if annotations_dict:
-            logger.info(f"First annotation: {annotations_dict[0]}")
+        logger.debug(f"Converted {len(annotations_dict)} annotations to dictionaries")
 
 
         analysis_result = await physics_service.analyze_structural_damage(
@@ -77,9 +249,12 @@ async def analyze_structural_damage(
         )
         
 
-        simulation_id = f"sim_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Time-ordered and collision-free, unlike the old second-resolution
+        # timestamp id which silently overwrote concurrent simulations
+        simulation_id = f"sim_{time.time_ns():x}_{token_hex(3)}"
         background_tasks.add_task(
             _generate_simulation_video,
+            video_service,
             simulation_id,
             building_data,
             annotations_dict,
@@ -95,7 +270,7 @@ async def analyze_structural_damage(
             confidence=analysis_result["confidence"],
             fea_results=analysis_result["fea_results"],
             collapse_simulation=analysis_result["collapse_simulation"],
-            video_url=f"http://192.168.1.20:8000/api/v1/simulation/video/placeholder/{simulation_id}",
+            video_url=str(req.url_for("placeholder_video", simulation_id=simulation_id)),
             generated_at=analysis_result["generated_at"]
         )
         
@@ -104,17 +279,16 @@ async def analyze_structural_damage(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @router.get("/video/{simulation_id}")
-async def get_simulation_video(simulation_id: str):
+async def get_simulation_video(simulation_id: str, req: Request):
     """
     Get generated simulation video
     """
     try:
 
-        video_path = f"simulation_videos/{simulation_id}.mp4"
-        if os.path.exists(video_path):
+        if await _video_exists(f"{simulation_id}.mp4"):
             return {
                 "simulation_id": simulation_id,
-                "video_url": f"http://192.168.1.20:8000/api/v1/simulation/video/file/{simulation_id}",
+                "video_url": str(req.url_for("video_file", simulation_id=simulation_id)),
                 "status": "completed",
                 "generated_at": datetime.now().isoformat()
             }
@@ -122,7 +296,7 @@ async def get_simulation_video(simulation_id: str):
 
             return {
                 "simulation_id": simulation_id,
-                "video_url": f"http://192.168.1.20:8000/api/v1/simulation/video/placeholder/{simulation_id}",
+                "video_url": str(req.url_for("placeholder_video", simulation_id=simulation_id)),
                 "status": "generating",
                 "generated_at": datetime.now().isoformat()
             }
@@ -130,181 +304,318 @@ async def get_simulation_video(simulation_id: str):
         logger.error(f"Video retrieval error: {str(e)}")
         raise HTTPException(status_code=404, detail="Video not found")
 
-@router.get("/video/file/{simulation_id}")
+@router.get("/video/file/{simulation_id}", name="video_file")
 async def serve_video_file(simulation_id: str):
     """
     Serve the actual video file
     """
     try:
         video_path = f"simulation_videos/{simulation_id}.mp4"
-        if os.path.exists(video_path):
-            from fastapi.responses import FileResponse
-            return FileResponse(video_path, media_type="video/mp4")
+        if await _video_exists(f"{simulation_id}.mp4"):
+            # Passing stat_result lets Starlette reuse it for
+            # Content-Length/ETag instead of stat-ing the file again
+            return FileResponse(video_path, media_type="video/mp4",
+                                stat_result=await _cached_stat(video_path))
         else:
             raise HTTPException(status_code=404, detail="Video file not found")
     except Exception as e:
         logger.error(f"Video file serving error: {str(e)}")
         raise HTTPException(status_code=500, detail="Error serving video file")
 
-@router.get("/video/placeholder/{simulation_id}")
-async def serve_placeholder_video(simulation_id: str):
+@router.get("/video/placeholder/{simulation_id}", name="placeholder_video")
+async def serve_placeholder_video(simulation_id: str, background_tasks: BackgroundTasks,
+                                  req: Request, preview: bool = False):
     """
     Serve ParaView video if available, otherwise generate placeholder
     """
     try:
 
         paraview_video_path = f"simulation_videos/{simulation_id}.mp4"
-        if os.path.exists(paraview_video_path):
+        if await _video_exists(f"{simulation_id}.mp4"):
             logger.info(f"Serving ParaView video: {paraview_video_path}")
-            from fastapi.responses import FileResponse
-            return FileResponse(paraview_video_path, media_type="video/mp4")
-
-
-        placeholder_path = f"simulation_videos/placeholder_{simulation_id}.mp4"
-        if not os.path.exists(placeholder_path):
-            os.makedirs("simulation_videos", exist_ok=True)
-
-            import cv2
-            import numpy as np
-            
-
-            width, height = 1920, 1080
-            fps = 30
-            duration = 10  
-            total_frames = duration * fps
-
-
-            fourcc = cv2.VideoWriter_fourcc(*'avc1')  
-            out = cv2.VideoWriter(placeholder_path, fourcc, fps, (width, height))
-
-            if not out.isOpened():
-                raise Exception("Could not open video writer")
-
-
-            PHASE_1_DURATION = 3.0  
-            PHASE_2_DURATION = 3.0 
-            PHASE_3_START = PHASE_1_DURATION + PHASE_2_DURATION 
-
-
-            for frame in range(total_frames):
-
-                frame_img = np.zeros((height, width, 3), dtype=np.uint8)
-                frame_img[:] = (20, 20, 20)
-
-                time = frame / fps
-                building_x = width // 2
-                building_width = 300
-                building_height = 500
-                num_floors = 5
-                floor_height = building_height // num_floors
-
-                if time < PHASE_1_DURATION:
-
-                    for floor in range(num_floors):
-                        y_pos = height - 150 - (floor * floor_height)
-                        cv2.rectangle(frame_img,
-                                     (building_x - building_width//2, y_pos),
-                                     (building_x + building_width//2, y_pos + floor_height),
-                                     (100, 100, 100), -1)
-                        cv2.rectangle(frame_img,
-                                     (building_x - building_width//2, y_pos),
-                                     (building_x + building_width//2, y_pos + floor_height),
-                                     (200, 200, 200), 2)
-
-
-                    if int(time * 2) % 2:
-                        cv2.rectangle(frame_img,
-                                     (building_x - 60 - 15, height - 150 - floor_height * 3),
-                                     (building_x - 60 + 15, height - 150 - floor_height * 2),
-                                     (0, 255, 255), 5)
-                        cv2.putText(frame_img, "DAMAGED COLUMN",
-                                   (building_x - 140, height - 150 - floor_height * 3 - 10),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-
-                    cv2.putText(frame_img, "PHASE 1: INITIAL CONDITION",
-                               (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 3)
-
-
-                elif time < PHASE_1_DURATION + PHASE_2_DURATION:
-
-                    for floor in range(num_floors):
-                        y_pos = height - 150 - (floor * floor_height)
-                        stress = 0.3 + (num_floors - floor) * 0.15  
-
-
-                        if stress < 0.5:
-                            color = (0, 255, int(255 * (1 - stress * 2)))  
-                        else:
-                            color = (0, int(255 * (1 - (stress - 0.5) * 2)), 255) 
+            return FileResponse(paraview_video_path, media_type="video/mp4",
+                                stat_result=await _cached_stat(paraview_video_path))
+
+
+        params = _PREVIEW_PARAMS if preview else _PLACEHOLDER_PARAMS
+        placeholder_path = _placeholder_path(*params)
+
+        # The filename is the content address, so it doubles as a strong
+        # ETag; polling clients that already hold the video get an empty
+        # 304 instead of megabytes of MP4
+        etag = f'"{os.path.basename(placeholder_path)}"'
+        if req.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        if not await _video_exists(os.path.basename(placeholder_path)):
+            os.makedirs(_VIDEO_DIR, exist_ok=True)
+
+            # Render after the response is sent; clients poll /status
+            background_tasks.add_task(_render_placeholder_task, *params)
+            return JSONResponse(
+                {
+                    "simulation_id": simulation_id,
+                    "status": "generating",
+                    "status_url": f"/api/v1/simulation/status/{simulation_id}"
+                },
+                status_code=202
+            )
+
+        # The file is identical for every simulation_id, so let browsers
+        # cache it for a day instead of re-downloading per simulation
+        return FileResponse(placeholder_path, media_type="video/mp4",
+                            stat_result=await _cached_stat(placeholder_path),
+                            headers={"Cache-Control": "public, max-age=86400, immutable",
+                                     "ETag": etag})
+    except Exception as e:
+        logger.error(f"Placeholder video error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error serving placeholder video")
 
-                        cv2.rectangle(frame_img,
-                                     (building_x - building_width//2, y_pos),
-                                     (building_x + building_width//2, y_pos + floor_height),
-                                     color, -1)
 
-                    cv2.circle(frame_img, (building_x - 60, height - 150 - floor_height * 3), 30, (0, 0, 255), 3)
-                    cv2.putText(frame_img, "CRITICAL POINT",
-                               (building_x - 140, height - 150 - floor_height * 3 - 40),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+async def _render_placeholder_task(width: int, height: int, fps: int, secs: int):
+    """Background task: render the shared placeholder video once"""
+    path = _placeholder_path(width, height, fps, secs)
+    try:
+        async with _placeholder_lock:
+            if not os.path.exists(path):
+                await asyncio.to_thread(
+                    _render_canonical_placeholder, path, width, height, fps, secs)
+                _known_videos.add(os.path.basename(path))
+    except Exception as e:
+        logger.error(f"Placeholder render task error: {str(e)}")
+
+
+def _render_canonical_placeholder(output_path: str, width: int, height: int,
+                                  fps: int, duration: int):
+    """Render the shared placeholder video (same content for every simulation_id)"""
+    import cv2
+    import numpy as np
+
+
+    total_frames = duration * fps
+    # Geometry was authored for 1080p; scale it so the preview variant
+    # keeps the same composition
+    scale = height / 1080
+
+
+    if AV_AVAILABLE:
+        codec = _pick_video_codec()
+        container = av.open(output_path, 'w')
+        stream = container.add_stream(codec, rate=fps)
+        stream.width = width
+        stream.height = height
+        stream.pix_fmt = 'yuv420p'
+        if codec == "h264_nvenc":
+            stream.options = {"preset": "p4", "bf": "0"}
+        elif codec == "libx264":
+            stream.options = {"preset": "ultrafast"}
+        out = None
+    elif FFMPEG_PATH:
+        out = _FfmpegWriter(output_path, fps, width, height)
+    else:
+        fourcc = cv2.VideoWriter_fourcc(*'avc1')
+        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+
+        if not out.isOpened():
+            raise Exception("Could not open video writer")
+
+
+    # Phases scale with the variant's duration (30%/30%/40%) so shorter
+    # variants like the 6s preview still reach the collapse phase
+    PHASE_1_DURATION = duration * 0.3
+    PHASE_2_DURATION = duration * 0.3
+    PHASE_3_START = PHASE_1_DURATION + PHASE_2_DURATION
+
+
+    building_x = width // 2
+    building_width = int(300 * scale)
+    building_height = int(500 * scale)
+    num_floors = 5
+    floor_height = building_height // num_floors
+
+
+    x_left = building_x - building_width // 2
+    x_right = building_x + building_width // 2
+    floor_rows = [(height - 150 - (floor * floor_height),
+                   height - 150 - (floor * floor_height) + floor_height)
+                  for floor in range(num_floors)]
+    floor_y0 = np.array([r[0] for r in floor_rows], dtype=np.int64)
+    floor_y1 = np.array([r[1] for r in floor_rows], dtype=np.int64)
+
+
+    # Fill colors are fixed per phase; compute them once, vectorized.
+    phase1_colors = np.full((num_floors, 3), 100, dtype=np.uint8)
+    stress = 0.3 + (num_floors - np.arange(num_floors)) * 0.15
+    phase2_colors = np.zeros((num_floors, 3), dtype=np.uint8)
+    phase2_colors[:, 1] = np.clip(
+        np.where(stress < 0.5, 255, 255 * (1 - (stress - 0.5) * 2)), 0, 255)
+    phase2_colors[:, 2] = np.clip(
+        np.where(stress < 0.5, 255 * (1 - stress * 2), 255), 0, 255)
+
+
+    # Static background rendered once: dark fill, safety rings, HUD box and
+    # captions. Per frame only the regions that actually change are
+    # refreshed from it instead of re-touching the full ~6 MB buffer.
+    ground_y = height - 150
+    static_background = np.full((height, width, 3), 20, dtype=np.uint8)
+    cv2.circle(static_background, (building_x, ground_y), int(200 * scale), (0, 0, 255), 3)
+    cv2.circle(static_background, (building_x, ground_y), int(350 * scale), (0, 255, 255), 2)
+    cv2.circle(static_background, (building_x, ground_y), int(500 * scale), (0, 255, 0), 2)
+    cv2.putText(static_background, "PREDICTED: PANCAKE COLLAPSE", (width - 700, height - 50),
+               cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 2)
+    static_background[20:80, width - 300:width - 50] = (0, 0, 255)
+    cv2.rectangle(static_background, (width - 300, 20), (width - 50, 80), (255, 255, 255), 2)
+    cv2.putText(static_background, "RISK: HIGH", (width - 280, 60),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+
+    # Elements that must re-appear on top of dynamic content: the safety
+    # rings (over the building) and the instruction-bar text (over the
+    # per-frame darkened bar).
+    static_overlay = np.zeros_like(static_background)
+    cv2.circle(static_overlay, (building_x, ground_y), int(200 * scale), (0, 0, 255), 3)
+    cv2.circle(static_overlay, (building_x, ground_y), int(350 * scale), (0, 255, 255), 2)
+    cv2.circle(static_overlay, (building_x, ground_y), int(500 * scale), (0, 255, 0), 2)
+    cv2.putText(static_overlay, "RISK: HIGH - AVOID BUILDING AND ADJACENT STRUCTURES",
+               (50, height - 115), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
+    static_mask = static_overlay.any(axis=2)[:, :, None]
+
+
+    # Phase-1 floor outlines never move; draw the grid once and composite
+    # it per frame instead of five cv2.rectangle calls.
+    grid_overlay = np.zeros_like(static_background)
+    for floor in range(num_floors):
+        y0, y1 = floor_rows[floor]
+        cv2.rectangle(grid_overlay, (x_left, y0), (x_right, y1), (200, 200, 200), 2)
+    grid_mask = grid_overlay.any(axis=2)[:, :, None]
+
+
+    # Phase decorations are static within their phase; rasterize the
+    # glyphs once instead of re-running cv2.putText per frame.
+    damaged_overlay = np.zeros_like(static_background)
+    cv2.rectangle(damaged_overlay,
+                  (building_x - 60 - 15, height - 150 - floor_height * 3),
+                  (building_x - 60 + 15, height - 150 - floor_height * 2),
+                  (0, 255, 255), 5)
+    cv2.putText(damaged_overlay, "DAMAGED COLUMN",
+               (building_x - 140, height - 150 - floor_height * 3 - 10),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    damaged_mask = damaged_overlay.any(axis=2)[:, :, None]
+
+    critical_overlay = np.zeros_like(static_background)
+    cv2.circle(critical_overlay, (building_x - 60, height - 150 - floor_height * 3),
+               30, (0, 0, 255), 3)
+    cv2.putText(critical_overlay, "CRITICAL POINT",
+               (building_x - 140, height - 150 - floor_height * 3 - 40),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+    critical_mask = critical_overlay.any(axis=2)[:, :, None]
+
+
+    # Only these regions change between frames. The building region is
+    # padded sideways so the 2 px floor outlines fall inside it.
+    ROI_TITLE = (slice(0, 80), slice(30, 1250))
+    ROI_BUILDING = (slice(height - 150 - building_height - 80, height),
+                    slice(x_left - 3, x_right + 3))
+    ROI_BAR = (slice(height - 150, height - 100), slice(30, width - 30))
+    ROI_TIME = (slice(height - 100, height), slice(30, 450))
+    ROIS = (ROI_BUILDING, ROI_BAR, ROI_TIME)
+
+
+    # Phase titles are constant within a phase; render each strip once and
+    # blit it instead of a putText per frame. Coordinates are relative to
+    # ROI_TITLE, which the strip assignment fully overwrites.
+    title_strips = []
+    for text, color, scale in (
+            ("PHASE 1: INITIAL CONDITION", (255, 255, 255), 1.2),
+            ("PHASE 2: STRESS ANALYSIS (FEA)", (0, 255, 255), 1.2),
+            ("PHASE 3: PREDICTED COLLAPSE - PANCAKE COLLAPSE", (0, 0, 255), 1.0)):
+        strip = static_background[ROI_TITLE].copy()
+        cv2.putText(strip, text, (20, 50), cv2.FONT_HERSHEY_SIMPLEX, scale, color, 3)
+        title_strips.append(strip)
+
+    # Phase-3 geometry and colors depend only on the frame index, so build
+    # the whole table up front instead of recomputing per frame.
+    floor_indices = np.arange(num_floors)
+    phase3_start_frame = int(PHASE_3_START * fps)
+    prog = np.minimum(1.0, np.arange(total_frames - phase3_start_frame)
+                      / fps / (duration - PHASE_3_START))
+    fall3 = (prog[:, None] * floor_indices * floor_height).astype(np.int64)
+    y0s3 = np.clip(floor_y0 + fall3, 0, height)
+    y1s3 = np.clip(floor_y1 + fall3, 0, height)
+    alphas3 = np.maximum(
+        0.0, 1.0 - prog[:, None] * (num_floors - floor_indices) / num_floors)
+    colors3 = np.repeat((alphas3[:, :, None] * 80.0).astype(np.uint8), 3, axis=2)
+
+    # Single frame buffer reused for all 300 frames; the ROI refresh above
+    # keeps it in sync with the static background.
+    frame_img = static_background.copy()
+
+    for frame in range(total_frames):
+
+        time = frame / fps
+
+        for roi in ROIS:
+            frame_img[roi] = static_background[roi]
+
+        if time < PHASE_1_DURATION:
+
+            _fill_floor_rects(frame_img, floor_y0, floor_y1, x_left, x_right, phase1_colors)
+            np.copyto(frame_img[ROI_BUILDING], grid_overlay[ROI_BUILDING],
+                      where=grid_mask[ROI_BUILDING])
+
+
+            if int(time * 2) % 2:
+                np.copyto(frame_img[ROI_BUILDING], damaged_overlay[ROI_BUILDING],
+                          where=damaged_mask[ROI_BUILDING])
+
+            frame_img[ROI_TITLE] = title_strips[0]
+
+
+        elif time < PHASE_1_DURATION + PHASE_2_DURATION:
+
+            _fill_floor_rects(frame_img, floor_y0, floor_y1, x_left, x_right, phase2_colors)
+
+            np.copyto(frame_img[ROI_BUILDING], critical_overlay[ROI_BUILDING],
+                      where=critical_mask[ROI_BUILDING])
 
-                    cv2.putText(frame_img, "PHASE 2: STRESS ANALYSIS (FEA)",
-                               (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 3)
+            frame_img[ROI_TITLE] = title_strips[1]
 
  
-                else:
-                    collapse_time = time - PHASE_3_START
-                    collapse_progress = min(1.0, collapse_time / 4.0)
-
-
-                    for floor in range(num_floors):
-                        fall_distance = collapse_progress * (floor * 100)
-                        y_pos = height - 150 - (floor * floor_height) + fall_distance
-                        alpha = max(0, 1.0 - collapse_progress * (num_floors - floor) / num_floors)
-                        color = tuple(int(c * alpha) for c in (80, 80, 80))
-
-                        cv2.rectangle(frame_img,
-                                     (building_x - building_width//2, int(y_pos)),
-                                     (building_x + building_width//2, int(y_pos + floor_height)),
-                                     color, -1)
-
-                    cv2.putText(frame_img, "PHASE 3: PREDICTED COLLAPSE - PANCAKE COLLAPSE",
-                               (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 3)
-
-
-                ground_y = height - 150
-                cv2.circle(frame_img, (building_x, ground_y), 200, (0, 0, 255), 3) 
-                cv2.circle(frame_img, (building_x, ground_y), 350, (0, 255, 255), 2) 
-                cv2.circle(frame_img, (building_x, ground_y), 500, (0, 255, 0), 2) 
+        else:
+            k = frame - phase3_start_frame
+            _fill_floor_rects(frame_img, y0s3[k], y1s3[k], x_left, x_right, colors3[k])
 
-                cv2.putText(frame_img, f"T+{time:.1f}s", (50, height - 50),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
-                cv2.putText(frame_img, "PREDICTED: PANCAKE COLLAPSE", (width - 700, height - 50),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 2)
+            frame_img[ROI_TITLE] = title_strips[2]
 
 
-                overlay = frame_img.copy()
-                cv2.rectangle(overlay, (30, height - 150), (width - 30, height - 100), (0, 0, 0), -1)
-                cv2.addWeighted(overlay, 0.7, frame_img, 0.3, 0, frame_img)
-                cv2.putText(frame_img, "RISK: HIGH - AVOID BUILDING AND ADJACENT STRUCTURES",
-                           (50, height - 115), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
+        # Translucent instruction bar: equivalent to the old overlay blend
+        # (0.7 black + 0.3 frame) but as a single in-place scale.
+        bar = frame_img[ROI_BAR]
+        np.multiply(bar, 0.3, out=bar, casting='unsafe')
 
+        np.copyto(frame_img[ROI_BUILDING], static_overlay[ROI_BUILDING],
+                  where=static_mask[ROI_BUILDING])
+        np.copyto(frame_img[ROI_BAR], static_overlay[ROI_BAR],
+                  where=static_mask[ROI_BAR])
 
-                cv2.rectangle(frame_img, (width - 300, 20), (width - 50, 80), (0, 0, 255), -1)
-                cv2.rectangle(frame_img, (width - 300, 20), (width - 50, 80), (255, 255, 255), 2)
-                cv2.putText(frame_img, "RISK: HIGH", (width - 280, 60),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        cv2.putText(frame_img, f"T+{time:.1f}s", (50, height - 50),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
 
 
-                out.write(frame_img)
-            
-            out.release()
-            logger.info(f"Generated real video: {placeholder_path}")
-        
-        from fastapi.responses import FileResponse
-        return FileResponse(placeholder_path, media_type="video/mp4")
-    except Exception as e:
-        logger.error(f"Placeholder video error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error serving placeholder video")
+        if out is not None:
+            out.write(frame_img)
+        else:
+            av_frame = av.VideoFrame.from_ndarray(frame_img, format='bgr24')
+            for packet in stream.encode(av_frame):
+                container.mux(packet)
+
+    if out is not None:
+        out.release()
+    else:
+        for packet in stream.encode():
+            container.mux(packet)
+        container.close()
+    logger.info(f"Rendered canonical placeholder video: {output_path}")
 
 @router.get("/status/{simulation_id}")
 async def get_simulation_status(simulation_id: str):
@@ -313,17 +624,23 @@ async def get_simulation_status(simulation_id: str):
     """
     try:
 
+        video_ready = (
+            os.path.exists(f"simulation_videos/{simulation_id}.mp4")
+            or os.path.exists(_PLACEHOLDER_PATH)
+            or os.path.exists(_PREVIEW_PATH)
+        )
         return {
             "simulation_id": simulation_id,
-            "status": "completed",
-            "progress": 100,
-            "video_ready": True
+            "status": "completed" if video_ready else "generating",
+            "progress": 100 if video_ready else 0,
+            "video_ready": video_ready
         }
     except Exception as e:
         logger.error(f"Status check error: {str(e)}")
         raise HTTPException(status_code=404, detail="Simulation not found")
 
 async def _generate_simulation_video(
+    video_service: SimulationVideoService,
     simulation_id: str,
     building_data: Dict,
     annotations: List[Dict],
@@ -355,10 +672,11 @@ async def _generate_simulation_video(
             "failure_probability": analysis_result["risk_metrics"]["failure_probability"]
         })
 
-        video_path = await video_service.generate_simulation_video(
-            simulation_data=enhanced_data,
-            output_path=output_path
-        )
+        async with _render_semaphore:
+            video_path = await video_service.generate_simulation_video(
+                simulation_data=enhanced_data,
+                output_path=output_path
+            )
         logger.info(f"✅ Enhanced OpenCV video generated: {video_path}")
 
     except Exception as e:
@@ -1,6 +1,8 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 from typing import List
 import os
@@ -21,15 +23,40 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Integrity Inspect API...")
     logger.info(f"OpenAI API Key: {'Set' if os.getenv('OPENAI_API_KEY') else 'Not Set'}")
+
+    # Build shared clients here rather than at module import so the
+    # AsyncOpenAI client is bound to the running event loop
+    import openai
+    from services.paraview_service import ParaViewService
+    from services.physics_simulation_service import PhysicsSimulationService
+    from services.simulation_video_service import SimulationVideoService
+
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    app.state.openai = openai.AsyncOpenAI(api_key=openai_api_key) if openai_api_key else None
+    app.state.paraview = ParaViewService(openai_client=app.state.openai)
+    app.state.physics = PhysicsSimulationService()
+    app.state.video = SimulationVideoService()
+
+    # Outside dev, warm the render workers in the background so the first
+    # simulation request does not pay VTK import and shader compilation
+    if os.getenv("ENV", "dev") != "dev":
+        asyncio.create_task(app.state.paraview.prewarm())
+
     yield
     # Shutdown
+    from services.gpt_service import close_shared_client
+    await close_shared_client()
+    app.state.paraview.close()
+    if app.state.openai:
+        await app.state.openai.close()
     logger.info("Shutting down Integrity Inspect API...")
 
 app = FastAPI(
     title="Integrity Inspect API",
     description="Emergency Structural Assessment API with GPT-5 and Sora Integration",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -85,10 +112,17 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+    # uvloop + httptools (both ship with uvicorn[standard]) lift the
+    # throughput ceiling well above the default asyncio/h11 stack.
+    # In production run with --workers $(nproc) instead of --reload.
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=os.getenv("ENV", "dev") == "dev",
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
         log_level="info"
     )
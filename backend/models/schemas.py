@@ -94,8 +94,10 @@ class PhysicsSimulationRequest(BaseModel):
     damage_description: str
     latitude: float
     longitude: float
-    annotations: List[AnnotationData]
-    photo_paths: List[str]
+    # Bounded so a pathological payload is rejected at parse time instead
+    # of reaching the physics/video pipeline
+    annotations: List[AnnotationData] = Field(max_length=256)
+    photo_paths: List[str] = Field(max_length=64)
 
 class PhysicsSimulationResponse(BaseModel):
     simulation_id: str
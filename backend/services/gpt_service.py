@@ -1,40 +1,62 @@
 import openai
 from openai import AsyncOpenAI
-import base64
+import aiofiles
+import asyncio
+import hashlib
+import httpx
 import json
-from typing import Dict, List, Optional
+import orjson
+import re
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 import os
+from io import BytesIO
+from PIL import Image
 
 logger = logging.getLogger(__name__)
 
-class GPTService:
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            logger.warning("OpenAI API key not provided - using mock responses")
-            self.client = None
-        else:
-            self.client = AsyncOpenAI(api_key=self.api_key)
-        self.model = os.getenv("GPT_MODEL", "gpt-4-vision-preview")
-
-    def encode_image(self, image_path: str) -> str:
-        """Encode image to base64 for GPT-4 Vision"""
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
-
-    async def analyze_structural_damage(
-        self,
-        building_data: Dict,
-        image_urls: List[str]
-    ) -> Dict:
-        """
-        Analyze building damage using GPT-4 Vision
-        Returns comprehensive safety assessment and Sora prompt
-        """
-
-        # Build the system message
-        system_message = """You are an expert structural engineer and disaster assessment specialist.
+try:
+    from pybase64 import b64encode as _b64encode
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    from base64 import b64encode as _b64encode
+    PYBASE64_AVAILABLE = False
+    logging.warning("pybase64 not available - falling back to stdlib base64")
+
+# One client — and one TCP/TLS keepalive pool — shared by every GPTService
+# instance, so only the very first request pays the handshake
+_shared_client: Optional[AsyncOpenAI] = None
+
+def _get_shared_client(api_key: str) -> AsyncOpenAI:
+    global _shared_client
+    if _shared_client is None:
+        # Bigger keepalive pool than the SDK default so burst traffic
+        # reuses warm connections; the SDK's own exponential backoff
+        # handles transient 429/503s
+        _shared_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=256, max_keepalive_connections=128),
+                timeout=60.0
+            ),
+            max_retries=3
+        )
+    return _shared_client
+
+async def close_shared_client() -> None:
+    """Shutdown hook: close the pooled client (called from the app lifespan)"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
+# Prompt text is hoisted to module constants and ordered static-first so the
+# token prefix is byte-identical across calls — OpenAI's automatic prompt
+# caching only kicks in on stable prefixes.
+_SYSTEM_MESSAGE = """You are an expert structural engineer and disaster assessment specialist.
 Your role is to analyze damaged buildings and provide critical safety assessments for emergency first responders.
 
 Given building parameters and damage photos, you MUST provide a detailed JSON response with:
@@ -56,45 +78,336 @@ Consider:
 
 Respond ONLY in valid JSON format."""
 
+_BATCH_SYSTEM_MESSAGE = _SYSTEM_MESSAGE.replace(
+    "Respond ONLY in valid JSON format.",
+    """You will be given SEVERAL buildings in one request, each introduced by a
+"### Building <id>" heading followed by its data and photos. Assess every
+building independently and respond ONLY with a JSON object of the form
+{"results": [{"building_id": <id>, ...assessment fields...}, ...]} containing
+one entry per building, in the order given."""
+)
 
-        damage_types_text = ", ".join(building_data.get('damage_types', []))
+_USER_PREAMBLE = """Please analyze the attached images and provide a comprehensive safety assessment for emergency responders.
+Focus on:
+1. Structural integrity assessment
+2. Risk of imminent collapse
+3. Safe approach routes
+4. Hazards to avoid
+5. Recommended safety measures
 
-        user_content = [
-            {
-                "type": "text",
-                "text": f"""## Building Assessment Data
+## Building Assessment Data
+"""
 
-**Building Type:** {building_data.get('building_type', 'Unknown')}
-**Number of Floors:** {building_data.get('number_of_floors', 'Unknown')}
-**Primary Material:** {building_data.get('primary_material', 'Unknown')}
-**Year Built:** {building_data.get('year_built', 'Unknown')}
+_USER_TEMPLATE = """
+**Building Type:** {building_type}
+**Number of Floors:** {number_of_floors}
+**Primary Material:** {primary_material}
+**Year Built:** {year_built}
 **Reported Damage Types:** {damage_types_text}
 
 **Damage Description:**
-{building_data.get('damage_description', 'No description provided')}
+{damage_description}
 
 **Location:**
-Latitude: {building_data.get('latitude', 'N/A')}
-Longitude: {building_data.get('longitude', 'N/A')}
+Latitude: {latitude}
+Longitude: {longitude}"""
+
+# Matches the "analysis" field once its closing quote has streamed in,
+# so dependent work can start before the rest of the completion arrives
+_ANALYSIS_FIELD_RE = re.compile(r'"analysis"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+_FIELD_DEFAULTS = {
+    'damage_description': 'No description provided',
+    'latitude': 'N/A',
+    'longitude': 'N/A',
+}
+
+# The vision model downscales to 2048px internally, so anything larger
+# just wastes upload bandwidth and base64 CPU
+_MAX_IMAGE_EDGE = 2048
+_JPEG_QUALITY = 85
+
+def _recompress_image(data: bytes) -> bytes:
+    """Downscale oversized photos to the model's effective input size and
+    recompress as JPEG; returns the original bytes if that is smaller or
+    the data is not a decodable image."""
+    try:
+        img = Image.open(BytesIO(data))
+        if max(img.size) <= _MAX_IMAGE_EDGE and img.format == "JPEG":
+            return data
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.thumbnail((_MAX_IMAGE_EDGE, _MAX_IMAGE_EDGE))
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", quality=_JPEG_QUALITY)
+        recompressed = buffer.getvalue()
+        return recompressed if len(recompressed) < len(data) else data
+    except Exception:
+        return data
+
+# Frozen fallback content — built once instead of per call
+_RESPONSE_DEFAULTS = MappingProxyType({
+    'risk_level': 'medium',
+    'analysis': 'Unable to complete full analysis. Manual inspection recommended.',
+    'recommendations': ('Conduct thorough manual inspection', 'Establish safe perimeter', 'Consult structural engineer'),
+    'sora_prompt': 'Generate a simulation showing potential structural failure',
+    'confidence': 'low'
+})
+
+_BASE_ACTIONS = (
+    "Establish a safety perimeter",
+    "Alert all personnel to potential hazards",
+    "Document all observations with photos"
+)
+_ACTIONS_HIGH = (
+    "EVACUATE IMMEDIATELY - Do not enter structure",
+    *_BASE_ACTIONS,
+    "Contact structural engineer for emergency assessment"
+)
+_ACTIONS_MEDIUM = (
+    "Proceed with extreme caution",
+    *_BASE_ACTIONS,
+    "Monitor for changes in structural condition"
+)
+_ACTIONS_LOW = (
+    *_BASE_ACTIONS,
+    "Continue standard safety protocols"
+)
+
+class _PromptFields(dict):
+    """format_map source that fills missing placeholders with defaults,
+    avoiding a chain of per-call dict.get lookups"""
+
+    def __missing__(self, key):
+        return _FIELD_DEFAULTS.get(key, 'Unknown')
 
-Please analyze the attached images and provide a comprehensive safety assessment for emergency responders.
-Focus on:
-1. Structural integrity assessment
-2. Risk of imminent collapse
-3. Safe approach routes
-4. Hazards to avoid
-5. Recommended safety measures"""
-            }
-        ]
+class GPTService:
+
+    # Repeat assessments of the same building with the same photos return
+    # the cached verdict instead of a multi-second vision call
+    _CACHE_TTL = 600.0
+    _CACHE_MAX = 1024
+    _BATCH_GROUP_SIZE = 4
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            logger.warning("OpenAI API key not provided - using mock responses")
+            self.client = None
+        else:
+            self.client = _get_shared_client(self.api_key)
+        self.model = os.getenv("GPT_MODEL", "gpt-4-vision-preview")
+        # Bounds in-flight API calls so a burst degrades gracefully instead
+        # of triggering a rate-limit storm
+        self._api_semaphore = asyncio.Semaphore(int(os.getenv("GPT_MAX_CONCURRENT", "32")))
+        self._analysis_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+
+    def _cache_key(self, building_data: Dict, image_urls: List[str]) -> str:
+        canonical = (orjson.dumps(building_data, option=orjson.OPT_SORT_KEYS, default=str)
+                     + b"|" + "|".join(sorted(image_urls)).encode())
+        # blake2b is the fastest keyed hash in the stdlib — noticeably
+        # quicker than sha256 on multi-KB damage descriptions, and 16
+        # bytes is plenty for a cache key
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+    async def encode_image(self, image_path: str) -> str:
+        """Encode image to base64 for GPT-4 Vision
+
+        Async so multiple images can be encoded concurrently with
+        asyncio.gather without stalling the event loop on disk reads;
+        base64 of multi-MB buffers is offloaded to a worker thread.
+        """
+        async with aiofiles.open(image_path, "rb") as image_file:
+            data = await image_file.read()
+        data = await asyncio.to_thread(_recompress_image, data)
+        encoded = await asyncio.to_thread(_b64encode, data)
+        return encoded.decode('ascii')
+
+    async def _resolve_image_url(self, url: str) -> str:
+        """Pass hosted URLs straight through and let OpenAI fetch them;
+        base64 data URIs (~33% payload inflation) are the fallback for
+        local-only files."""
+        if url.startswith(("http://", "https://", "data:")):
+            return url
+        encoded = await self.encode_image(url)
+        return f"data:image/jpeg;base64,{encoded}"
+
+    async def analyze_structural_damage(
+        self,
+        building_data: Dict,
+        image_urls: List[str],
+        on_analysis: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """
+        Analyze building damage using GPT-4 Vision
+        Returns comprehensive safety assessment and Sora prompt
+
+        on_analysis, if given, is called once with the analysis text as
+        soon as it is available mid-stream (see assess_and_summarize).
+
+        Identical (building_data, image_urls) requests within the TTL are
+        served from an in-memory cache; a per-key lock prevents concurrent
+        duplicates from each paying for their own API call.
+        """
+        cache_key = self._cache_key(building_data, image_urls)
+
+        cached = self._analysis_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            self._analysis_cache.move_to_end(cache_key)
+            logger.info(f"Returning cached GPT analysis for key {cache_key[:12]}")
+            return cached[1]
+
+        lock = self._cache_locks.setdefault(cache_key, asyncio.Lock())
+        async with lock:
+            # Re-check: another request may have populated the cache while
+            # we were waiting on the lock
+            cached = self._analysis_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            result = await self._analyze_uncached(building_data, image_urls, on_analysis)
+
+            if 'error' not in result:
+                self._analysis_cache[cache_key] = (time.monotonic() + self._CACHE_TTL, result)
+                self._analysis_cache.move_to_end(cache_key)
+                while len(self._analysis_cache) > self._CACHE_MAX:
+                    self._analysis_cache.popitem(last=False)
+
+        self._cache_locks.pop(cache_key, None)
+        return result
+
+    async def assess_and_summarize(
+        self,
+        building_data: Dict,
+        image_urls: List[str],
+        assessment_data: Dict
+    ) -> Tuple[Dict, str]:
+        """
+        Run the damage analysis and the report summary as an overlapped
+        pipeline: the summary call starts as soon as the analysis text has
+        streamed in, instead of waiting for the full completion.
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+
+        def _start_summary(analysis_text: str) -> None:
+            if 'summary' not in tasks:
+                tasks['summary'] = asyncio.create_task(
+                    self.generate_report_summary(assessment_data, {'analysis': analysis_text})
+                )
+
+        analysis_result = await self.analyze_structural_damage(
+            building_data, image_urls, on_analysis=_start_summary
+        )
+
+        # Cache hits and fallback responses skip the mid-stream hook
+        if 'summary' not in tasks:
+            tasks['summary'] = asyncio.create_task(
+                self.generate_report_summary(assessment_data, analysis_result)
+            )
 
-        for idx, url in enumerate(image_urls[:5]):  
+        return analysis_result, await tasks['summary']
+
+    async def analyze_batch(self, buildings: List[Dict]) -> List[Dict]:
+        """
+        Assess many buildings in few requests for bulk incident triage.
+
+        Each entry is {"building_data": Dict, "image_urls": List[str]}.
+        Buildings are packed up to _BATCH_GROUP_SIZE per completion so the
+        network/TLS and prompt overhead is amortized; groups run
+        concurrently under the API semaphore. Results come back in input
+        order with the same shape as analyze_structural_damage.
+        """
+        groups = [
+            buildings[i:i + self._BATCH_GROUP_SIZE]
+            for i in range(0, len(buildings), self._BATCH_GROUP_SIZE)
+        ]
+        group_results = await asyncio.gather(*[self._analyze_group(g) for g in groups])
+        return [result for group in group_results for result in group]
+
+    async def _analyze_group(self, group: List[Dict]) -> List[Dict]:
+        if not self.client or len(group) == 1:
+            # Mock mode, or nothing to amortize — the single-building path
+            # also benefits from its cache
+            return [
+                await self.analyze_structural_damage(
+                    b["building_data"], b.get("image_urls", [])
+                )
+                for b in group
+            ]
+
+        user_content = []
+        for idx, building in enumerate(group):
+            building_data = building["building_data"]
+            fields = _PromptFields(building_data)
+            fields['damage_types_text'] = ", ".join(building_data.get('damage_types', []))
             user_content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": url,
-                    "detail": "high"  
-                }
+                "type": "text",
+                "text": f"### Building {idx}\n" + _USER_TEMPLATE.format_map(fields)
             })
+            # Two photos per building keeps the grouped request inside a
+            # sane token budget
+            resolved_urls = await asyncio.gather(
+                *[self._resolve_image_url(url) for url in building.get("image_urls", [])[:2]]
+            )
+            for url in resolved_urls:
+                user_content.append({
+                    "type": "image_url",
+                    "image_url": {"url": url, "detail": "low"}
+                })
+
+        try:
+            logger.info(f"Analyzing batch of {len(group)} buildings")
+            async with self._api_semaphore:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": _BATCH_SYSTEM_MESSAGE},
+                        {"role": "user", "content": user_content}
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=1200 * len(group),
+                    temperature=0.3
+                )
+
+            parsed = orjson.loads(response.choices[0].message.content)
+            by_id = {}
+            for entry in parsed.get("results", []):
+                try:
+                    by_id[int(entry.get("building_id"))] = entry
+                except (TypeError, ValueError):
+                    pass
+            return [
+                self._normalize_result(
+                    by_id.get(idx, {}), len(building.get("image_urls", [])[:2])
+                )
+                for idx, building in enumerate(group)
+            ]
+
+        except Exception as e:
+            logger.error(f"Batch GPT analysis error: {str(e)}")
+            return [
+                self._create_fallback_response(b["building_data"], str(e))
+                for b in group
+            ]
+
+    async def _analyze_uncached(
+        self,
+        building_data: Dict,
+        image_urls: List[str],
+        on_analysis: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+
+        fields = _PromptFields(building_data)
+        fields['damage_types_text'] = ", ".join(building_data.get('damage_types', []))
+
+        # Static preamble first, variable building values after, images last
+        user_content = [
+            {
+                "type": "text",
+                "text": _USER_PREAMBLE + _USER_TEMPLATE.format_map(fields)
+            }
+        ]
 
         try:
             logger.info(f"Analyzing building: {building_data.get('building_type')} with {len(image_urls)} images")
@@ -114,84 +427,135 @@ Focus on:
                     "confidence": "medium"
                 }
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_content}
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=2500,
-                temperature=0.3  
+            # A photo that fails to resolve (missing file, bad path) is
+            # dropped rather than failing the whole assessment
+            resolved_urls = await asyncio.gather(
+                *[self._resolve_image_url(url) for url in image_urls[:5]],
+                return_exceptions=True
             )
-
-
-            result = json.loads(response.choices[0].message.content)
+            for idx, url in enumerate(resolved_urls):
+                if isinstance(url, BaseException):
+                    logger.warning(f"Skipping unreadable photo {image_urls[idx]}: {url}")
+                    continue
+                user_content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": url,
+                        # "high" costs ~765 vision tokens per image vs ~85
+                        # for "low"; full fidelity on the primary photo only
+                        "detail": "high" if idx == 0 else "low"
+                    }
+                })
+
+            # Streaming keeps tokens flowing as they are generated instead
+            # of one long idle await on the full 2500-token completion; the
+            # semaphore is held until the stream drains since the connection
+            # stays busy for that long
+            async with self._api_semaphore:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": _SYSTEM_MESSAGE},
+                        {"role": "user", "content": user_content}
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=2500,
+                    temperature=0.3,
+                    stream=True
+                )
+
+                chunks = []
+                watch_buffer = "" if on_analysis else None
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        delta = chunk.choices[0].delta.content
+                        chunks.append(delta)
+                        if watch_buffer is not None:
+                            watch_buffer += delta
+                            match = _ANALYSIS_FIELD_RE.search(watch_buffer)
+                            if match:
+                                watch_buffer = None
+                                on_analysis(json.loads(f'"{match.group(1)}"'))
+
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the
+            # handler below still catches malformed responses
+            result = orjson.loads("".join(chunks))
 
             logger.info(f"GPT analysis completed: Risk Level = {result.get('risk_level')}, Confidence = {result.get('confidence')}")
 
-
-            required_fields = ['risk_level', 'analysis', 'recommendations', 'sora_prompt']
-            for field in required_fields:
-                if field not in result:
-                    logger.warning(f"Missing required field in GPT response: {field}")
-                    result[field] = self._get_default_value(field)
-
-
-            if isinstance(result.get('recommendations'), str):
-                result['recommendations'] = [result['recommendations']]
-
-
-            if 'immediate_actions' not in result:
-                result['immediate_actions'] = self._generate_default_actions(result.get('risk_level', 'medium'))
-
-            return {
-                "risk_level": result.get("risk_level", "medium"),
-                "analysis": result.get("analysis", "Analysis unavailable"),
-                "failure_mode": result.get("failure_mode", "Unable to determine"),
-                "recommendations": result.get("recommendations", []),
-                "immediate_actions": result.get("immediate_actions", []),
-                "sora_prompt": result.get("sora_prompt", ""),
-                "confidence": result.get("confidence", "medium"),
-                "model_used": self.model,
-                "images_analyzed": len(image_urls)
-            }
+            return self._normalize_result(result, len(image_urls))
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse GPT response as JSON: {str(e)}")
-            return self._create_fallback_response(building_data, "JSON parsing error")
+            # One repair pass recovers most malformed responses; far better
+            # than discarding the whole assessment for a generic fallback
+            try:
+                result = await self._repair_json("".join(chunks))
+                logger.info("Recovered malformed GPT response via repair retry")
+                return self._normalize_result(result, len(image_urls))
+            except Exception as repair_error:
+                logger.error(f"JSON repair retry failed: {str(repair_error)}")
+                return self._create_fallback_response(building_data, "JSON parsing error")
 
         except Exception as e:
             logger.error(f"GPT analysis error: {str(e)}")
             return self._create_fallback_response(building_data, str(e))
 
-    def _get_default_value(self, field: str) -> any:
-        defaults = {
-            'risk_level': 'medium',
-            'analysis': 'Unable to complete full analysis. Manual inspection recommended.',
-            'recommendations': ['Conduct thorough manual inspection', 'Establish safe perimeter', 'Consult structural engineer'],
-            'sora_prompt': 'Generate a simulation showing potential structural failure',
-            'confidence': 'low'
-        }
-        return defaults.get(field, 'Unknown')
+    async def _repair_json(self, bad_content: str) -> Dict:
+        """Ask the model to fix its own malformed JSON, preserving the
+        original fields and values"""
+        async with self._api_semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{
+                    "role": "user",
+                    "content": "Fix this to be valid JSON, keeping the same fields and values. "
+                               "Respond ONLY with the corrected JSON object:\n" + bad_content
+                }],
+                response_format={"type": "json_object"},
+                max_tokens=2500,
+                temperature=0.0
+            )
+        return orjson.loads(response.choices[0].message.content)
 
-    def _generate_default_actions(self, risk_level: str) -> List[str]:
-        base_actions = [
-            "Establish a safety perimeter",
-            "Alert all personnel to potential hazards",
-            "Document all observations with photos"
-        ]
+    def _normalize_result(self, result: Dict, images_analyzed: int) -> Dict:
+        """Fill missing fields and coerce types so callers always get the
+        same response shape"""
+        required_fields = ['risk_level', 'analysis', 'recommendations', 'sora_prompt']
+        for field in required_fields:
+            if field not in result:
+                logger.warning(f"Missing required field in GPT response: {field}")
+                result[field] = self._get_default_value(field)
 
-        if risk_level in ['high', 'critical']:
-            base_actions.insert(0, "EVACUATE IMMEDIATELY - Do not enter structure")
-            base_actions.append("Contact structural engineer for emergency assessment")
-        elif risk_level == 'medium':
-            base_actions.insert(0, "Proceed with extreme caution")
-            base_actions.append("Monitor for changes in structural condition")
-        else:
-            base_actions.append("Continue standard safety protocols")
+        if isinstance(result.get('recommendations'), str):
+            result['recommendations'] = [result['recommendations']]
+
+        if 'immediate_actions' not in result:
+            result['immediate_actions'] = self._generate_default_actions(result.get('risk_level', 'medium'))
 
-        return base_actions
+        return {
+            "risk_level": result.get("risk_level", "medium"),
+            "analysis": result.get("analysis", "Analysis unavailable"),
+            "failure_mode": result.get("failure_mode", "Unable to determine"),
+            "recommendations": result.get("recommendations", []),
+            "immediate_actions": result.get("immediate_actions", []),
+            "sora_prompt": result.get("sora_prompt", ""),
+            "confidence": result.get("confidence", "medium"),
+            "model_used": self.model,
+            "images_analyzed": images_analyzed
+        }
+
+    def _get_default_value(self, field: str) -> any:
+        value = _RESPONSE_DEFAULTS.get(field, 'Unknown')
+        # Copy the one mutable default so callers can extend it safely
+        return list(value) if isinstance(value, tuple) else value
+
+    def _generate_default_actions(self, risk_level: str) -> List[str]:
+        if risk_level in ('high', 'critical'):
+            return list(_ACTIONS_HIGH)
+        if risk_level == 'medium':
+            return list(_ACTIONS_MEDIUM)
+        return list(_ACTIONS_LOW)
 
     def _create_fallback_response(self, building_data: Dict, error: str) -> Dict:
         return {
@@ -225,21 +589,22 @@ Focus on:
 
     async def generate_report_summary(self, assessment_data: Dict, analysis_result: Dict) -> str:
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a technical writer. Create a concise 2-3 sentence executive summary."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Assessment: {assessment_data}\nAnalysis: {analysis_result['analysis']}"
-                    }
-                ],
-                max_tokens=150,
-                temperature=0.5
-            )
+            async with self._api_semaphore:
+                response = await self.client.chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a technical writer. Create a concise 2-3 sentence executive summary."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Assessment: {assessment_data}\nAnalysis: {analysis_result['analysis']}"
+                        }
+                    ],
+                    max_tokens=150,
+                    temperature=0.5
+                )
 
             return response.choices[0].message.content
 
@@ -1,31 +1,190 @@
+from __future__ import annotations
 
-
-import json
+import asyncio
+import functools
+import hashlib
+import multiprocessing
+import orjson
 import os
+import queue
+import shutil
 import subprocess
 import tempfile
 import logging
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from pathlib import Path
-import numpy as np
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+
+def _vtk_worker_main(conn):
+    """Entry point for a long-lived render worker: pay the interpreter,
+    VTK and OpenCV import cost once, then execute generated scripts
+    received over the pipe until told to stop."""
+    import runpy
+    import traceback
+
+    import vtk  # noqa: F401 - preloaded for the scripts run below
+    import cv2  # noqa: F401
+    import numpy  # noqa: F401
+
+    # Warm the GL stack with a throwaway frame so the first real render
+    # does not pay context creation and shader compilation
+    try:
+        _renderer = vtk.vtkRenderer()
+        _window = vtk.vtkRenderWindow()
+        _window.AddRenderer(_renderer)
+        _window.SetSize(64, 64)
+        _window.SetOffScreenRendering(1)
+        _window.Render()
+        del _renderer, _window
+    except Exception:
+        pass
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            runpy.run_path(job["script"], run_name="__main__")
+            conn.send({"ok": True})
+        except BaseException:
+            conn.send({"ok": False, "error": traceback.format_exc()})
+
+
+class VTKWorkerPool:
+    """Small pool of persistent render workers.
+
+    Spawning `python script.py` per render pays interpreter startup plus
+    the VTK shared-library load every time. Workers here import VTK once
+    and then execute generated scripts on demand; a hung worker is killed
+    and replaced so one bad render cannot wedge the pool."""
+
+    def __init__(self, size: Optional[int] = None, timeout: float = 600.0):
+        # The scripts parallelize frames internally, so a couple of
+        # workers is enough to cover back-to-back requests
+        self._size = size or min(2, os.cpu_count() or 1)
+        self._timeout = timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue" = queue.Queue()
+        for _ in range(self._size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        # Not daemonic: the generated scripts spawn their own frame-render
+        # ProcessPoolExecutor, which daemonic processes are forbidden to
+        # do. close() / lifespan shutdown handles cleanup instead.
+        proc = self._ctx.Process(target=_vtk_worker_main, args=(child_conn,))
+        proc.start()
+        child_conn.close()
+        return proc, parent_conn
+
+    def run(self, script_file: str) -> None:
+        """Execute one script on an idle worker (blocks until one frees up)."""
+        proc, conn = self._idle.get()
+        try:
+            conn.send({"script": script_file})
+            if not conn.poll(self._timeout):
+                proc.kill()
+                proc.join()
+                proc, conn = self._spawn()
+                raise subprocess.TimeoutExpired(script_file, self._timeout)
+            result = conn.recv()
+            if not result["ok"]:
+                raise Exception(f"VTK rendering failed: {result['error'][-1000:]}")
+        except (EOFError, ConnectionError):
+            proc.kill()
+            proc.join()
+            proc, conn = self._spawn()
+            raise Exception("VTK render worker died mid-render")
+        finally:
+            self._idle.put((proc, conn))
+
+    def close(self):
+        while True:
+            try:
+                proc, conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.kill()
+
+
 class ParaViewService:
 
 
     def __init__(self, openai_client=None):
-        self.paraview_path = self._find_paraview_executable()
-        self.temp_dir = tempfile.mkdtemp()
         self.openai_client = openai_client
-
-    def _find_paraview_executable(self) -> Optional[str]:
+        # Executable probing, temp dir creation and the render worker
+        # pool are deferred to first use so constructing the service
+        # stays cheap when no simulation ever runs
+        self._temp_dir: Optional[str] = None
+        self._worker_pool: Optional[VTKWorkerPool] = None
+        self._render_locks: Dict[str, asyncio.Lock] = {}
+        self._test_pipeline = None
+
+    @property
+    def paraview_path(self) -> Optional[str]:
+        return self._find_paraview_executable()
+
+    @property
+    def temp_dir(self) -> str:
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp()
+        return self._temp_dir
+
+    @property
+    def _inst_cache_dir(self) -> str:
+        path = os.path.join(self.temp_dir, ".inst_cache")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @property
+    def _render_cache_dir(self) -> str:
+        path = os.path.join(self.temp_dir, ".render_cache")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def close(self):
+        """Shut down the render worker pool, if one was started."""
+        if self._worker_pool is not None:
+            self._worker_pool.close()
+            self._worker_pool = None
+
+    async def prewarm(self):
+        """Spawn the render workers and run the health check up front so
+        the first user-facing render skips worker startup, VTK import and
+        shader compilation. Intended for app startup."""
+        if self._worker_pool is None:
+            self._worker_pool = await asyncio.to_thread(VTKWorkerPool)
+        await self.test_paraview()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _find_paraview_executable() -> Optional[str]:
+        # Resolved once per process - re-probing pvpython on every service
+        # construction costs a subprocess spawn per candidate path
+
+        found = shutil.which("pvpython")
+        if found:
+            # Version check deferred to first actual use
+            logger.info(f"Found ParaView at: {found}")
+            return found
 
         possible_paths = [
-            "pvpython",
-            "pvpython.exe",
-            "/usr/bin/pvpython",
-            "/usr/local/bin/pvpython",
             r"C:\Program Files\ParaView 5.11.0\bin\pvpython.exe",
             r"C:\Program Files\ParaView 5.12.0\bin\pvpython.exe",
             r"C:\Program Files\ParaView\bin\pvpython.exe",
@@ -33,6 +192,8 @@ class ParaViewService:
         ]
 
         for path in possible_paths:
+            if not os.path.isfile(path):
+                continue
             try:
                 result = subprocess.run(
                     [path, "--version"],
@@ -48,7 +209,7 @@ class ParaViewService:
                 continue
 
         logger.warning("ParaView not found on system - using VTK standalone")
-        return "python" 
+        return "python"
 
     def is_available(self) -> bool:
 
@@ -74,24 +235,30 @@ class ParaViewService:
             logger.info("Preparing data for ParaView/VTK simulation...")
 
 
-            simulation_instructions = await self._generate_simulation_instructions(
+            # Mesh construction does not depend on the GPT instructions, so
+            # the completion runs in flight while the mesh is built off the
+            # event loop; the instructions are spliced in afterwards
+            inst_task = asyncio.create_task(self._generate_simulation_instructions(
                 building_data,
                 annotations,
                 fea_results,
                 collapse_simulation
-            )
-
-            logger.info(f"GPT-5 simulation instructions: {simulation_instructions[:200]}...")
+            ))
 
-
-            vtk_data = self._convert_to_vtk_format(
+            vtk_data = await asyncio.to_thread(
+                self._convert_to_vtk_format,
                 building_data,
                 annotations,
                 fea_results,
                 collapse_simulation,
-                simulation_instructions
+                ""
             )
 
+            simulation_instructions = await inst_task
+            vtk_data["simulation"]["instructions"] = simulation_instructions
+
+            logger.info(f"GPT-5 simulation instructions: {simulation_instructions[:200]}...")
+
             vtk_files = self._save_vtk_datasets(vtk_data)
 
             logger.info(f"Saved {len(vtk_files)} VTK datasets")
@@ -99,8 +266,7 @@ class ParaViewService:
             script_content = self._generate_paraview_script(
                 vtk_files,
                 output_path,
-                simulation_instructions,
-                vtk_data
+                simulation_instructions
             )
             script_file = os.path.join(self.temp_dir, "paraview_simulation.py")
 
@@ -228,6 +394,15 @@ Provide a comprehensive, technically accurate analysis for 3D visualization:
 
 Provide your analysis in clear, structured format. Be specific about numbers, timings, and technical details. This will guide a physics-based 3D simulation."""
 
+            # Identical assessments produce identical prompts - serve those
+            # from disk instead of re-running a multi-second completion
+            cache_key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+            cache_file = os.path.join(self._inst_cache_dir, f"{cache_key}.txt")
+            if os.path.isfile(cache_file):
+                logger.info(f"Returning cached simulation instructions for key {cache_key[:12]}")
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    return f.read()
+
             response = await self.openai_client.chat.completions.create(
                 model="gpt-4o",  
                 messages=[
@@ -240,6 +415,9 @@ Provide your analysis in clear, structured format. Be specific about numbers, ti
 
             instructions = response.choices[0].message.content
             logger.info("Generated GPT-5 simulation instructions")
+
+            with open(cache_file, "w", encoding="utf-8") as f:
+                f.write(instructions)
             return instructions
 
         except Exception as e:
@@ -353,46 +531,44 @@ Provide your analysis in clear, structured format. Be specific about numbers, ti
 
     def _create_structural_mesh(self, length: float, width: float, height: float, floors: int) -> Dict:
         """Create VTK structural mesh grid with realistic structural elements"""
+        import numpy as np
 
 
         nx = max(8, min(15, int(length / 2)))  
         ny = max(8, min(15, int(width / 2)))   
         nz = floors * 4  
 
-        points = []
-        cells = []
-
-        for k in range(nz + 1):
-            for j in range(ny + 1):
-                for i in range(nx + 1):
-                    x = (i / nx - 0.5) * length
-                    y = (j / ny - 0.5) * width
-                    z = (k / nz) * height
-
-
-                    if i > 0 and i < nx and j > 0 and j < ny and k > 0 and k < nz:
-                        import random
-                        random.seed(i * 1000 + j * 100 + k)  
-                        x += random.uniform(-0.1, 0.1)
-                        y += random.uniform(-0.1, 0.1)
-
-                    points.append([x, y, z])
-
-        for k in range(nz):
-            for j in range(ny):
-                for i in range(nx):
-
-                    idx = i + j * (nx + 1) + k * (nx + 1) * (ny + 1)
-                    cells.append([
-                        idx,
-                        idx + 1,
-                        idx + 1 + (nx + 1),
-                        idx + (nx + 1),
-                        idx + (nx + 1) * (ny + 1),
-                        idx + 1 + (nx + 1) * (ny + 1),
-                        idx + 1 + (nx + 1) + (nx + 1) * (ny + 1),
-                        idx + (nx + 1) + (nx + 1) * (ny + 1)
-                    ])
+        # Point grid built in one vectorized pass, k-major to preserve the
+        # i + j*(nx+1) + k*(nx+1)*(ny+1) indexing the cells rely on
+        K, J, I = np.meshgrid(
+            np.arange(nz + 1), np.arange(ny + 1), np.arange(nx + 1), indexing='ij'
+        )
+        x = (I / nx - 0.5) * length
+        y = (J / ny - 0.5) * width
+        z = (K / nz) * height
+
+        # Seeded jitter on interior points for a less artificial look
+        interior = (I > 0) & (I < nx) & (J > 0) & (J < ny) & (K > 0) & (K < nz)
+        rng = np.random.default_rng(0)
+        jitter = rng.uniform(-0.1, 0.1, size=(int(interior.sum()), 2))
+        x[interior] += jitter[:, 0]
+        y[interior] += jitter[:, 1]
+
+        points = np.stack([x, y, z], axis=-1).reshape(-1, 3).astype(np.float32)
+
+        # Hexahedron connectivity by broadcasting over the lower-corner
+        # indices: one (ncells, 8) int32 array instead of per-cell lists
+        kk, jj, ii = np.meshgrid(
+            np.arange(nz), np.arange(ny), np.arange(nx), indexing='ij'
+        )
+        base = (ii + jj * (nx + 1) + kk * (nx + 1) * (ny + 1)).ravel()
+        layer = (nx + 1) * (ny + 1)
+        offsets = np.array(
+            [0, 1, 1 + (nx + 1), nx + 1,
+             layer, 1 + layer, 1 + (nx + 1) + layer, (nx + 1) + layer],
+            dtype=np.int32
+        )
+        cells = (base[:, None] + offsets).astype(np.int32)
 
         return {
             "points": points,
@@ -422,24 +598,98 @@ Provide your analysis in clear, structured format. Be specific about numbers, ti
         vtk_files = []
 
 
-        mesh_file = os.path.join(self.temp_dir, "structure_mesh.vtk")
-        self._write_vtk_unstructured_grid(
-            mesh_file,
-            vtk_data["mesh"]["points"],
-            vtk_data["mesh"]["cells"]
-        )
+        try:
+            mesh_file = os.path.join(self.temp_dir, "structure_mesh.vtu")
+            self._write_vtu_binary(
+                mesh_file,
+                vtk_data["mesh"]["points"],
+                vtk_data["mesh"]["cells"]
+            )
+        except ImportError:
+            # No VTK in this interpreter - keep the legacy ASCII path
+            mesh_file = os.path.join(self.temp_dir, "structure_mesh.vtk")
+            self._write_vtk_unstructured_grid(
+                mesh_file,
+                vtk_data["mesh"]["points"],
+                vtk_data["mesh"]["cells"]
+            )
         vtk_files.append(mesh_file)
 
 
         data_file = os.path.join(self.temp_dir, "simulation_data.json")
-        with open(data_file, 'w') as f:
-            json.dump(vtk_data, f, indent=2)
+        # The mesh arrays already live in the mesh file above - writing them
+        # into the JSON as well doubles the serialize/parse work, so only the
+        # grid dimensions go along
+        vtk_data_json = {k: v for k, v in vtk_data.items() if k != "mesh"}
+        vtk_data_json["mesh"] = {"dimensions": vtk_data["mesh"]["dimensions"]}
+        # orjson serializes the NumPy arrays natively and skips the indent
+        # whitespace stdlib json would spend time (and file size) on
+        with open(data_file, 'wb') as f:
+            f.write(orjson.dumps(vtk_data_json, option=orjson.OPT_SERIALIZE_NUMPY, default=str))
         vtk_files.append(data_file)
 
         return vtk_files
 
-    def _write_vtk_unstructured_grid(self, filename: str, points: List, cells: List):
+    def _build_vtk_grid_inproc(self, points: np.ndarray, cells: np.ndarray):
+        """Build a vtkUnstructuredGrid that references the NumPy buffers
+        directly (deep=False), so the mesh never gets a second copy on the
+        VTK side. The backing arrays are parked on self so they outlive
+        the grid."""
+        import numpy as np
+        import vtk
+        from vtk.util import numpy_support
+
+        points = np.ascontiguousarray(points, dtype=np.float32)
+
+        # vtkCellArray wants [npts, id0..id7] per cell as one flat id array
+        ncells = len(cells)
+        connectivity = np.empty((ncells, 9), dtype=np.int64)
+        connectivity[:, 0] = 8
+        connectivity[:, 1:] = cells
+        connectivity = connectivity.ravel()
+
+        grid = vtk.vtkUnstructuredGrid()
+
+        vtk_points = vtk.vtkPoints()
+        vtk_points.SetData(numpy_support.numpy_to_vtk(points, deep=False))
+        grid.SetPoints(vtk_points)
+
+        cell_array = vtk.vtkCellArray()
+        cell_array.SetCells(
+            ncells, numpy_support.numpy_to_vtkIdTypeArray(connectivity, deep=False)
+        )
+        grid.SetCells(vtk.VTK_HEXAHEDRON, cell_array)
+
+        # Zero-copy means VTK does not own this memory - hold the refs
+        self._grid_buffers = (points, connectivity)
+        return grid
+
+    def _write_vtu_binary(self, filename: str, points: np.ndarray, cells: np.ndarray):
+        """Write the mesh as binary XML .vtu - the NumPy arrays go into VTK
+        as bulk memcpys instead of one formatted text line per point/cell,
+        and the file comes out ~5x smaller"""
+        import vtk
+
+        grid = self._build_vtk_grid_inproc(points, cells)
+
+        writer = vtk.vtkXMLUnstructuredGridWriter()
+        writer.SetFileName(filename)
+        writer.SetInputData(grid)
+        writer.SetDataModeToAppended()
+        writer.SetCompressorTypeToLZ4()
+        writer.Write()
+
+        logger.info(f"Wrote binary VTU file: {filename}")
+
+    def _write_vtk_unstructured_grid(self, filename: str, points: np.ndarray, cells: np.ndarray):
         """Write VTK unstructured grid file (legacy format)"""
+        import numpy as np
+
+        points = np.asarray(points)
+        cells = np.asarray(cells)
+
+        # Each section goes out as one np.savetxt block instead of a
+        # formatted write per point/cell
         with open(filename, 'w') as f:
 
             f.write("# vtk DataFile Version 3.0\n")
@@ -449,17 +699,17 @@ Provide your analysis in clear, structured format. Be specific about numbers, ti
 
 
             f.write(f"POINTS {len(points)} float\n")
-            for point in points:
-                f.write(f"{point[0]} {point[1]} {point[2]}\n")
+            np.savetxt(f, points, fmt="%g")
 
-            total_size = sum(len(cell) + 1 for cell in cells)
+            total_size = cells.shape[0] * (cells.shape[1] + 1)
             f.write(f"\nCELLS {len(cells)} {total_size}\n")
-            for cell in cells:
-                f.write(f"{len(cell)} " + " ".join(map(str, cell)) + "\n")
+            prefixed = np.hstack(
+                [np.full((len(cells), 1), cells.shape[1], dtype=cells.dtype), cells]
+            )
+            np.savetxt(f, prefixed, fmt="%d")
 
             f.write(f"\nCELL_TYPES {len(cells)}\n")
-            for _ in cells:
-                f.write("12\n")
+            f.write("12\n" * len(cells))
 
         logger.info(f"Wrote VTK file: {filename}")
 
@@ -467,8 +717,7 @@ Provide your analysis in clear, structured format. Be specific about numbers, ti
         self,
         vtk_files: List[str],
         output_path: str,
-        simulation_instructions: str,
-        vtk_data: Dict
+        simulation_instructions: str
     ) -> str:
         """Generate Python script for ParaView/VTK visualization"""
 
@@ -476,370 +725,533 @@ Provide your analysis in clear, structured format. Be specific about numbers, ti
         output_path_fixed = output_path.replace("\\", "/")
 
 
-        building = vtk_data["building"]
-        simulation = vtk_data["simulation"]
-        damage_points = vtk_data["damage"]["points"]
-
         script = f'''
 import vtk
-import json
+import orjson
+import os
+import shutil
+import subprocess
 import numpy as np
+import cv2
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Load simulation data
-with open("{vtk_files_str[1]}", "r") as f:
-    sim_data = json.load(f)
+with open("{vtk_files_str[1]}", "rb") as f:
+    sim_data = orjson.loads(f.read())
 
-# Video settings
+# Video settings - everything scene-specific comes out of the JSON the
+# service already wrote, so the generated source stays constant-size
 width, height = 1280, 720
-fps = {simulation["fps"]}
-duration = {simulation["duration"]}
+fps = sim_data["simulation"]["fps"]
+duration = sim_data["simulation"]["duration"]
 total_frames = int(duration * fps)
+failure_time = sim_data["analysis"]["failure_time"]
+failure_frame = int(failure_time * fps)
+building_dims = sim_data["building"]["dimensions"]
+building_height = building_dims["height"]
 
-# Create renderer and render window
-renderer = vtk.vtkRenderer()
-render_window = vtk.vtkRenderWindow()
-render_window.AddRenderer(renderer)
-render_window.SetSize(width, height)
-render_window.SetOffScreenRendering(1)
+damage_points = sim_data["damage"]["points"]
 
-# Load structural mesh
-reader = vtk.vtkUnstructuredGridReader()
-reader.SetFileName("{vtk_files_str[0]}")
-reader.Update()
+# Scene objects are built once per worker process by _init_worker; frames
+# render independently thanks to the absolute kinematic tables below
+_scene = {{}}
 
-# Create mapper and actor for structure
-mapper = vtk.vtkDataSetMapper()
-mapper.SetInputConnection(reader.GetOutputPort())
+def _make_render_window():
+    # GPU-backed EGL offscreen context when the VTK build has one;
+    # the generic window typically lands on software OSMesa headless
+    if hasattr(vtk, "vtkEGLRenderWindow"):
+        try:
+            return vtk.vtkEGLRenderWindow()
+        except Exception:
+            pass
+    return vtk.vtkRenderWindow()
+
+def _init_worker():
+    # Create renderer and render window
+    renderer = vtk.vtkRenderer()
+    render_window = _make_render_window()
+    render_window.AddRenderer(renderer)
+    render_window.SetSize(width, height)
+    render_window.SetOffScreenRendering(1)
+
+    # Load structural mesh (binary XML .vtu, or legacy ASCII fallback)
+    mesh_file = "{vtk_files_str[0]}"
+    if mesh_file.endswith(".vtu"):
+        reader = vtk.vtkXMLUnstructuredGridReader()
+    else:
+        reader = vtk.vtkUnstructuredGridReader()
+    reader.SetFileName(mesh_file)
+    reader.Update()
 
-structure_actor = vtk.vtkActor()
-structure_actor.SetMapper(mapper)
+    # Create mapper and actor for structure
+    mapper = vtk.vtkDataSetMapper()
+    mapper.SetInputConnection(reader.GetOutputPort())
 
-# Set building appearance based on material and type
-building_type = sim_data["building"]["type"]
-material = sim_data["building"]["material"]
-age = sim_data["building"]["age"]
+    structure_actor = vtk.vtkActor()
+    structure_actor.SetMapper(mapper)
 
-# Material-specific colors and properties
-if material == "concrete":
-    # Concrete: Gray with slight weathering based on age
-    base_color = 0.7 - (age / 200.0)  # Darker with age
-    structure_actor.GetProperty().SetColor(base_color, base_color, base_color + 0.05)
-    structure_actor.GetProperty().SetOpacity(0.85)
-elif material == "steel":
-    # Steel: Metallic gray-blue
-    structure_actor.GetProperty().SetColor(0.6, 0.65, 0.7)
-    structure_actor.GetProperty().SetOpacity(0.75)
-    structure_actor.GetProperty().SetMetallic(0.8)
-    structure_actor.GetProperty().SetRoughness(0.3)
-elif material == "brick":
-    # Brick: Reddish-brown
-    structure_actor.GetProperty().SetColor(0.7, 0.4, 0.3)
-    structure_actor.GetProperty().SetOpacity(0.9)
-elif material == "wood":
-    # Wood: Brown tones
-    structure_actor.GetProperty().SetColor(0.6, 0.45, 0.3)
-    structure_actor.GetProperty().SetOpacity(0.8)
-else:
-    # Default: neutral gray
-    structure_actor.GetProperty().SetColor(0.7, 0.7, 0.7)
-    structure_actor.GetProperty().SetOpacity(0.8)
-
-# Building type affects visual style
-if building_type == "commercial":
-    # Commercial buildings: cleaner, more uniform
-    structure_actor.GetProperty().SetSpecular(0.3)
-    structure_actor.GetProperty().SetSpecularPower(20)
-elif building_type == "industrial":
-    # Industrial: rougher appearance
-    structure_actor.GetProperty().SetSpecular(0.1)
-    structure_actor.GetProperty().SetSpecularPower(5)
-else:  # residential
-    # Residential: moderate specular
-    structure_actor.GetProperty().SetSpecular(0.2)
-    structure_actor.GetProperty().SetSpecularPower(10)
-
-renderer.AddActor(structure_actor)
-
-# Add damage markers
-damage_points = {json.dumps(damage_points)}
-for damage in damage_points:
+    # Set building appearance based on material and type
+    building_type = sim_data["building"]["type"]
+    material = sim_data["building"]["material"]
+    age = sim_data["building"]["age"]
+
+    # Material-specific colors and properties
+    if material == "concrete":
+        # Concrete: Gray with slight weathering based on age
+        base_color = 0.7 - (age / 200.0)  # Darker with age
+        structure_actor.GetProperty().SetColor(base_color, base_color, base_color + 0.05)
+        structure_actor.GetProperty().SetOpacity(0.85)
+    elif material == "steel":
+        # Steel: Metallic gray-blue
+        structure_actor.GetProperty().SetColor(0.6, 0.65, 0.7)
+        structure_actor.GetProperty().SetOpacity(0.75)
+        structure_actor.GetProperty().SetMetallic(0.8)
+        structure_actor.GetProperty().SetRoughness(0.3)
+    elif material == "brick":
+        # Brick: Reddish-brown
+        structure_actor.GetProperty().SetColor(0.7, 0.4, 0.3)
+        structure_actor.GetProperty().SetOpacity(0.9)
+    elif material == "wood":
+        # Wood: Brown tones
+        structure_actor.GetProperty().SetColor(0.6, 0.45, 0.3)
+        structure_actor.GetProperty().SetOpacity(0.8)
+    else:
+        # Default: neutral gray
+        structure_actor.GetProperty().SetColor(0.7, 0.7, 0.7)
+        structure_actor.GetProperty().SetOpacity(0.8)
+
+    # Building type affects visual style
+    if building_type == "commercial":
+        # Commercial buildings: cleaner, more uniform
+        structure_actor.GetProperty().SetSpecular(0.3)
+        structure_actor.GetProperty().SetSpecularPower(20)
+    elif building_type == "industrial":
+        # Industrial: rougher appearance
+        structure_actor.GetProperty().SetSpecular(0.1)
+        structure_actor.GetProperty().SetSpecularPower(5)
+    else:  # residential
+        # Residential: moderate specular
+        structure_actor.GetProperty().SetSpecular(0.2)
+        structure_actor.GetProperty().SetSpecularPower(10)
+
+    renderer.AddActor(structure_actor)
+
+    # Add damage markers: one sphere source + one mapper shared by all
+    # actors, so the marker geometry lives on the GPU once instead of
+    # once per annotation
     sphere = vtk.vtkSphereSource()
-    sphere.SetCenter(damage["position"])
     sphere.SetRadius(0.5)
 
     damage_mapper = vtk.vtkPolyDataMapper()
     damage_mapper.SetInputConnection(sphere.GetOutputPort())
 
-    damage_actor = vtk.vtkActor()
-    damage_actor.SetMapper(damage_mapper)
-    severity = damage["severity"]
-    damage_actor.GetProperty().SetColor(1.0, 1.0 - severity, 0.0)
-    renderer.AddActor(damage_actor)
-
-# Add ground plane
-plane = vtk.vtkPlaneSource()
-plane.SetOrigin(-50, -50, -1)
-plane.SetPoint1(50, -50, -1)
-plane.SetPoint2(-50, 50, -1)
-
-plane_mapper = vtk.vtkPolyDataMapper()
-plane_mapper.SetInputConnection(plane.GetOutputPort())
-
-plane_actor = vtk.vtkActor()
-plane_actor.SetMapper(plane_mapper)
-plane_actor.GetProperty().SetColor(0.3, 0.4, 0.3)
-renderer.AddActor(plane_actor)
-
-# Camera setup
-camera = renderer.GetActiveCamera()
-camera.SetPosition({building["dimensions"]["length"]} * 1.5,
-                   -{building["dimensions"]["width"]} * 1.5,
-                   {building["dimensions"]["height"]} * 0.8)
-camera.SetFocalPoint(0, 0, {building["dimensions"]["height"]} / 2)
-camera.SetViewUp(0, 0, 1)
-
-# Lighting
-light = vtk.vtkLight()
-light.SetPosition(20, -20, 30)
-light.SetIntensity(1.5)
-renderer.AddLight(light)
-
-renderer.SetBackground(0.1, 0.1, 0.1)
-
-# Setup video writer
-output_dir = Path("{output_path_fixed}").parent
-output_dir.mkdir(parents=True, exist_ok=True)
-
-window_to_image = vtk.vtkWindowToImageFilter()
-window_to_image.SetInput(render_window)
-
-# Use PNG writer and then convert to video with OpenCV
-import cv2
-temp_frames = []
+    for damage in damage_points:
+        damage_actor = vtk.vtkActor()
+        damage_actor.SetMapper(damage_mapper)
+        damage_actor.SetPosition(damage["position"])
+        severity = damage["severity"]
+        damage_actor.GetProperty().SetColor(1.0, 1.0 - severity, 0.0)
+        renderer.AddActor(damage_actor)
+
+    # Add ground plane
+    plane = vtk.vtkPlaneSource()
+    plane.SetOrigin(-50, -50, -1)
+    plane.SetPoint1(50, -50, -1)
+    plane.SetPoint2(-50, 50, -1)
+
+    plane_mapper = vtk.vtkPolyDataMapper()
+    plane_mapper.SetInputConnection(plane.GetOutputPort())
+
+    plane_actor = vtk.vtkActor()
+    plane_actor.SetMapper(plane_mapper)
+    plane_actor.GetProperty().SetColor(0.3, 0.4, 0.3)
+    renderer.AddActor(plane_actor)
+
+    # Camera setup (re-homed per frame in render_frame)
+    camera = renderer.GetActiveCamera()
+    camera.SetViewUp(0, 0, 1)
+
+    # Lighting
+    light = vtk.vtkLight()
+    light.SetPosition(20, -20, 30)
+    light.SetIntensity(1.5)
+    renderer.AddLight(light)
+
+    renderer.SetBackground(0.1, 0.1, 0.1)
+
+    window_to_image = vtk.vtkWindowToImageFilter()
+    window_to_image.SetInput(render_window)
+    # The loop renders explicitly, so skip the filter's internal re-render
+    # and the front-buffer glReadPixels; RGB matches the capture path below
+    window_to_image.ShouldRerenderOff()
+    window_to_image.ReadFrontBufferOff()
+    window_to_image.SetInputBufferTypeToRGB()
+
+    _scene.update(
+        render_window=render_window,
+        structure_actor=structure_actor,
+        camera=camera,
+        window_to_image=window_to_image,
+        base_opacity=structure_actor.GetProperty().GetOpacity(),
+    )
+
+# Absolute per-frame kinematics: the original loop applied Azimuth/
+# Elevation/RotateX incrementally, so the cumulative sums are precomputed
+# here to keep frames order-independent
+frame_idx = np.arange(total_frames)
+azimuth_table = 0.2 * (frame_idx + 1)
+elevation_table = np.cumsum(0.05 * np.sin(frame_idx / total_frames * 3.14159))
+collapse_progress_table = np.where(
+    frame_idx > failure_frame,
+    (frame_idx - failure_frame) / max(1, total_frames - failure_frame),
+    0.0,
+)
+rotation_table = np.cumsum(collapse_progress_table * 10)
+drop_table = -collapse_progress_table * (building_height * 0.8)
+opacity_table = 0.8 * (1.0 - collapse_progress_table * 0.5)
+
+# Loop-invariant camera home pose - only the Azimuth/Elevation offsets
+# change per frame
+camera_home = (building_dims["length"] * 1.5,
+               -building_dims["width"] * 1.5,
+               building_height * 0.8)
+camera_focus = (0, 0, building_height / 2)
+
+def render_frame(frame):
+    if not _scene:
+        _init_worker()
+    structure_actor = _scene["structure_actor"]
+    camera = _scene["camera"]
 
-print("Rendering frames...")
-failure_frame = int({vtk_data["analysis"]["failure_time"]} * fps)
-
-for frame in range(total_frames):
-    progress = frame / total_frames
     time = frame / fps
 
     # Animate collapse after failure time
     if frame > failure_frame:
-        collapse_progress = (frame - failure_frame) / (total_frames - failure_frame)
-
-        # Animate structure collapse (translate downward)
-        position = structure_actor.GetPosition()
-        structure_actor.SetPosition(
-            position[0],
-            position[1],
-            -collapse_progress * {building["dimensions"]["height"]} * 0.8
-        )
-
-        # Fade opacity
-        structure_actor.GetProperty().SetOpacity(0.8 * (1.0 - collapse_progress * 0.5))
-
-        # Rotate slightly
-        structure_actor.RotateX(collapse_progress * 10)
+        structure_actor.SetPosition(0, 0, float(drop_table[frame]))
+        structure_actor.GetProperty().SetOpacity(float(opacity_table[frame]))
+        structure_actor.SetOrientation(float(rotation_table[frame]), 0, 0)
+    else:
+        structure_actor.SetPosition(0, 0, 0)
+        structure_actor.GetProperty().SetOpacity(_scene["base_opacity"])
+        structure_actor.SetOrientation(0, 0, 0)
 
-    # Animate camera
-    camera.Azimuth(0.2)
-    camera.Elevation(0.05 * np.sin(progress * 3.14159))
+    # Animate camera from its home pose using the cumulative tables
+    camera.SetPosition(*camera_home)
+    camera.SetFocalPoint(*camera_focus)
+    camera.SetViewUp(0, 0, 1)
+    camera.Azimuth(float(azimuth_table[frame]))
+    camera.Elevation(float(elevation_table[frame]))
 
     # Render frame
+    render_window = _scene["render_window"]
     render_window.Render()
 
     # Capture frame
+    window_to_image = _scene["window_to_image"]
     window_to_image.Modified()
     window_to_image.Update()
 
     image_data = window_to_image.GetOutput()
     dims = image_data.GetDimensions()
 
-    # Convert VTK image to numpy array
+    # Convert VTK image to numpy array: vertical flip and RGB->BGR are
+    # zero-copy strided views, so the single ascontiguousarray below is
+    # the only real copy (and makes the frame writable)
     vtk_array = image_data.GetPointData().GetScalars()
     numpy_array = np.frombuffer(vtk_array, dtype=np.uint8)
-    numpy_array = numpy_array.reshape((dims[1], dims[0], 3))
-    numpy_array = np.flip(numpy_array, axis=0)  # Flip vertically
-    numpy_array = cv2.cvtColor(numpy_array, cv2.COLOR_RGB2BGR)
+    numpy_array = numpy_array.reshape((dims[1], dims[0], 3))[::-1, :, ::-1]
+    numpy_array = np.ascontiguousarray(numpy_array)
 
     # ===========================================================
-    # ADD TEXT OVERLAYS WITH ALL INFORMATION
+    # COMPOSITE PRE-RENDERED OVERLAYS + PER-FRAME TIMESTAMP
     # ===========================================================
+    segments = composite_pre if time < failure_time else composite_post
+    for y0, y1, inv_alpha, premult, scratch in segments:
+        band = numpy_array[y0:y1]
+        np.multiply(band, inv_alpha, out=scratch)
+        scratch += premult
+        numpy_array[y0:y1] = scratch
 
-    # Extract analysis data
-    safety_factor = sim_data["analysis"]["safety_factor"]
-    failure_prob = sim_data["analysis"]["failure_probability"]
-    building_type = sim_data["building"]["type"]
-    floors = sim_data["building"]["floors"]
-    material = sim_data["building"]["material"]
-    age = sim_data["building"]["age"]
+    cv2.putText(numpy_array, f"T+{{time:.2f}}s / {{duration:.1f}}s",
+                (20, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
 
-    # Determine risk level based on safety factor and failure probability
-    if safety_factor < 0.8 or failure_prob > 0.7:
-        risk_level = "CRITICAL"
-        risk_color = (0, 0, 255)  # Red
-    elif safety_factor < 1.0 or failure_prob > 0.5:
-        risk_level = "HIGH"
-        risk_color = (0, 100, 255)  # Orange
-    elif safety_factor < 1.2 or failure_prob > 0.3:
-        risk_level = "MEDIUM"
-        risk_color = (0, 255, 255)  # Yellow
-    else:
-        risk_level = "LOW"
-        risk_color = (0, 255, 0)  # Green
-
-    # Extract collapse mechanism from GPT instructions
-    instructions = sim_data["simulation"]["instructions"]
-    collapse_type = "PANCAKE COLLAPSE"  # Default
-    if "pancake" in instructions.lower():
-        collapse_type = "PANCAKE COLLAPSE"
-    elif "progressive" in instructions.lower():
-        collapse_type = "PROGRESSIVE COLLAPSE"
-    elif "lean-to" in instructions.lower() or "lean to" in instructions.lower():
-        collapse_type = "LEAN-TO COLLAPSE"
-    elif "v-shape" in instructions.lower() or "v shape" in instructions.lower():
-        collapse_type = "V-SHAPE COLLAPSE"
-
-    # Simulation phase
-    if time < {vtk_data["analysis"]["failure_time"]}:
-        phase = "INITIAL CONDITION"
-        phase_color = (255, 255, 255)
-    else:
-        phase = f"COLLAPSE IN PROGRESS - {{collapse_type}}"
-        phase_color = (0, 0, 255)
+    return numpy_array
 
-    # ===========================================================
-    # OVERLAY 1: RISK LEVEL (Top Right)
-    # ===========================================================
-    cv2.rectangle(numpy_array, (width - 300, 10), (width - 10, 100), (0, 0, 0), -1)
-    cv2.rectangle(numpy_array, (width - 300, 10), (width - 10, 100), risk_color, 3)
-    cv2.putText(numpy_array, f"RISK: {{risk_level}}",
-                (width - 280, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.9, risk_color, 3)
-    cv2.putText(numpy_array, f"SF: {{safety_factor:.2f}}",
-                (width - 280, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+# ===========================================================
+# PRE-RENDER TEXT OVERLAYS (once, not per frame)
+# ===========================================================
+safety_factor = sim_data["analysis"]["safety_factor"]
+failure_prob = sim_data["analysis"]["failure_probability"]
+building_type = sim_data["building"]["type"]
+floors = sim_data["building"]["floors"]
+material = sim_data["building"]["material"]
+age = sim_data["building"]["age"]
 
-    # ===========================================================
-    # OVERLAY 2: BUILDING INFORMATION (Top Left)
-    # ===========================================================
-    cv2.rectangle(numpy_array, (10, 10), (400, 150), (0, 0, 0), -1)
-    cv2.rectangle(numpy_array, (10, 10), (400, 150), (100, 100, 100), 2)
-    cv2.putText(numpy_array, f"{{building_type.upper()}} BUILDING",
-                (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 3)
-    cv2.putText(numpy_array, f"Floors: {{floors}} | Material: {{material.upper()}}",
-                (20, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-    cv2.putText(numpy_array, f"Age: {{age}} years | SF: {{safety_factor:.2f}}",
-                (20, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-    cv2.putText(numpy_array, f"Failure Prob: {{failure_prob*100:.1f}}%",
-                (20, 115), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-    cv2.putText(numpy_array, f"Damage Points: {{len(damage_points)}}",
-                (20, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+# Determine risk level based on safety factor and failure probability
+if safety_factor < 0.8 or failure_prob > 0.7:
+    risk_level = "CRITICAL"
+    risk_color = (0, 0, 255)  # Red
+elif safety_factor < 1.0 or failure_prob > 0.5:
+    risk_level = "HIGH"
+    risk_color = (0, 100, 255)  # Orange
+elif safety_factor < 1.2 or failure_prob > 0.3:
+    risk_level = "MEDIUM"
+    risk_color = (0, 255, 255)  # Yellow
+else:
+    risk_level = "LOW"
+    risk_color = (0, 255, 0)  # Green
+
+# Extract collapse mechanism from GPT instructions
+instructions = sim_data["simulation"]["instructions"].lower()
+collapse_type = "PANCAKE COLLAPSE"  # Default
+if "pancake" in instructions:
+    collapse_type = "PANCAKE COLLAPSE"
+elif "progressive" in instructions:
+    collapse_type = "PROGRESSIVE COLLAPSE"
+elif "lean-to" in instructions or "lean to" in instructions:
+    collapse_type = "LEAN-TO COLLAPSE"
+elif "v-shape" in instructions or "v shape" in instructions:
+    collapse_type = "V-SHAPE COLLAPSE"
+
+def _opaque(color):
+    return (color[0], color[1], color[2], 255)
+
+# All fixed elements go into BGRA templates; the loop just composites
+base_overlay = np.zeros((height, width, 4), np.uint8)
+
+# Risk level (top right)
+cv2.rectangle(base_overlay, (width - 300, 10), (width - 10, 100), (0, 0, 0, 255), -1)
+cv2.rectangle(base_overlay, (width - 300, 10), (width - 10, 100), _opaque(risk_color), 3)
+cv2.putText(base_overlay, f"RISK: {{risk_level}}",
+            (width - 280, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.9, _opaque(risk_color), 3)
+cv2.putText(base_overlay, f"SF: {{safety_factor:.2f}}",
+            (width - 280, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200, 255), 1)
+
+# Building information (top left)
+cv2.rectangle(base_overlay, (10, 10), (400, 150), (0, 0, 0, 255), -1)
+cv2.rectangle(base_overlay, (10, 10), (400, 150), (100, 100, 100, 255), 2)
+cv2.putText(base_overlay, f"{{building_type.upper()}} BUILDING",
+            (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255, 255), 3)
+cv2.putText(base_overlay, f"Floors: {{floors}} | Material: {{material.upper()}}",
+            (20, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200, 255), 1)
+cv2.putText(base_overlay, f"Age: {{age}} years | SF: {{safety_factor:.2f}}",
+            (20, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200, 255), 1)
+cv2.putText(base_overlay, f"Failure Prob: {{failure_prob*100:.1f}}%",
+            (20, 115), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200, 255), 1)
+cv2.putText(base_overlay, f"Damage Points: {{len(damage_points)}}",
+            (20, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200, 255), 1)
+
+# Watermark (bottom right)
+cv2.putText(base_overlay, "IntegrityInspect AI",
+            (width - 250, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 150, 255), 1)
+
+# Safety warning banner (bottom, semi-transparent)
+if risk_level in ["HIGH", "CRITICAL"]:
+    warning_text = f"! {{risk_level}} RISK - AVOID BUILDING AND SURROUNDINGS"
+    cv2.rectangle(base_overlay, (0, height - 80), (width, height - 40), (0, 0, 0, 178), -1)
+    cv2.putText(base_overlay, warning_text,
+                (50, height - 52), cv2.FONT_HERSHEY_SIMPLEX, 0.9, _opaque(risk_color), 3)
 
-    # ===========================================================
-    # OVERLAY 3: SIMULATION PHASE (Center Top)
-    # ===========================================================
+def _with_phase(template, phase, phase_color, show_mechanism):
+    out = template.copy()
     text_size = cv2.getTextSize(phase, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 3)[0]
     text_x = (width - text_size[0]) // 2
-    cv2.rectangle(numpy_array, (text_x - 15, 10), (text_x + text_size[0] + 15, 60), (0, 0, 0), -1)
-    cv2.putText(numpy_array, phase,
-                (text_x, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.9, phase_color, 3)
-
-    # ===========================================================
-    # OVERLAY 4: COLLAPSE MECHANISM (Center - during collapse)
-    # ===========================================================
-    if time >= {vtk_data["analysis"]["failure_time"]}:
-        collapse_text = f"{{collapse_type}}"
-        text_size = cv2.getTextSize(collapse_text, cv2.FONT_HERSHEY_SIMPLEX, 1.2, 4)[0]
+    cv2.rectangle(out, (text_x - 15, 10), (text_x + text_size[0] + 15, 60), (0, 0, 0, 255), -1)
+    cv2.putText(out, phase, (text_x, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.9, _opaque(phase_color), 3)
+    if show_mechanism:
+        text_size = cv2.getTextSize(collapse_type, cv2.FONT_HERSHEY_SIMPLEX, 1.2, 4)[0]
         text_x = (width - text_size[0]) // 2
         text_y = height // 2 - 100
+        cv2.rectangle(out, (text_x - 20, text_y - 40), (text_x + text_size[0] + 20, text_y + 10), (0, 0, 0, 178), -1)
+        cv2.putText(out, collapse_type, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255, 255), 4)
+    return out
+
+overlay_pre = _with_phase(base_overlay, "INITIAL CONDITION", (255, 255, 255), False)
+overlay_post = _with_phase(base_overlay, f"COLLAPSE IN PROGRESS - {{collapse_type}}", (0, 0, 255), True)
+
+def _composite_params(overlay):
+    # Blend only the contiguous row bands that carry overlay pixels
+    alpha_full = overlay[:, :, 3:4].astype(np.float32) / 255.0
+    covered = alpha_full[:, :, 0].any(axis=1)
+    segments = []
+    y = 0
+    while y < height:
+        if covered[y]:
+            y0 = y
+            while y < height and covered[y]:
+                y += 1
+            alpha = alpha_full[y0:y]
+            premult = overlay[y0:y, :, :3].astype(np.float32) * alpha
+            # Per-segment scratch so the blend below runs without any
+            # per-frame float allocation
+            segments.append((y0, y, 1.0 - alpha, premult, np.empty_like(premult)))
+        else:
+            y += 1
+    return segments
+
+composite_pre = _composite_params(overlay_pre)
+composite_post = _composite_params(overlay_post)
+
+FFMPEG_PATH = shutil.which("ffmpeg")
+
+def _ffmpeg_codec_args():
+    # NVENC when the build has it, else software libx264
+    try:
+        encoders = subprocess.run(
+            [FFMPEG_PATH, "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+    except Exception:
+        encoders = ""
+    if "h264_nvenc" in encoders:
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-b:v", "6M"]
+    return ["-c:v", "libx264", "-preset", "ultrafast", "-threads", "0"]
+
+class _FfmpegWriter:
+    # cv2.VideoWriter-compatible wrapper around an ffmpeg stdin pipe
+    def __init__(self, output_path):
+        self.proc = subprocess.Popen(
+            [FFMPEG_PATH, "-y", "-loglevel", "error",
+             "-f", "rawvideo", "-pix_fmt", "bgr24",
+             "-s", f"{{width}}x{{height}}", "-r", str(fps), "-i", "-",
+             *_ffmpeg_codec_args(),
+             "-pix_fmt", "yuv420p", output_path],
+            stdin=subprocess.PIPE
+        )
 
-        # Semi-transparent background
-        overlay = numpy_array.copy()
-        cv2.rectangle(overlay, (text_x - 20, text_y - 40), (text_x + text_size[0] + 20, text_y + 10), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, numpy_array, 0.3, 0, numpy_array)
-
-        cv2.putText(numpy_array, collapse_text,
-                    (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 4)
-
-    # ===========================================================
-    # OVERLAY 5: TIMESTAMP (Bottom Left)
-    # ===========================================================
-    cv2.putText(numpy_array, f"T+{{time:.2f}}s / {{duration:.1f}}s",
-                (20, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-
-    # ===========================================================
-    # OVERLAY 6: SAFETY WARNING (Bottom - semi-transparent banner)
-    # ===========================================================
-    warning_text = f"! {{risk_level}} RISK - AVOID BUILDING AND SURROUNDINGS"
-    if risk_level in ["HIGH", "CRITICAL"]:
-        overlay = numpy_array.copy()
-        cv2.rectangle(overlay, (0, height - 80), (width, height - 40), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, numpy_array, 0.3, 0, numpy_array)
-        cv2.putText(numpy_array, warning_text,
-                    (50, height - 52), cv2.FONT_HERSHEY_SIMPLEX, 0.9, risk_color, 3)
+    def write(self, frame):
+        self.proc.stdin.write(memoryview(frame))
 
-    # ===========================================================
-    # OVERLAY 7: IntegrityInspect Watermark (Bottom Right)
-    # ===========================================================
-    cv2.putText(numpy_array, "IntegrityInspect AI",
-                (width - 250, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 150), 1)
+    def release(self):
+        self.proc.stdin.close()
+        self.proc.wait()
 
-    temp_frames.append(numpy_array)
+if __name__ == "__main__":
+    print("Rendering frames...")
+    output_dir = Path("{output_path_fixed}").parent
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-    if frame % 30 == 0:
-        print(f"  Frame {{frame}}/{{total_frames}} ({{progress*100:.1f}}%)")
+    # Stream each frame straight to the encoder - peak memory stays at a
+    # handful of in-flight frames instead of the whole clip
+    # Pipe raw BGR into ffmpeg when available (hardware H.264 if the build
+    # has NVENC); otherwise fall back to OpenCV's avc1 writer
+    if FFMPEG_PATH:
+        out = _FfmpegWriter("{output_path_fixed}")
+    else:
+        fourcc = cv2.VideoWriter_fourcc(*'avc1')  # H.264 codec
+        out = cv2.VideoWriter("{output_path_fixed}", fourcc, fps, (width, height))
+
+    # One offscreen render window per worker; executor.map keeps frames
+    # in submission order so the single writer stays sequential
+    workers = min(os.cpu_count() or 1, 8)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for frame, numpy_array in enumerate(
+                executor.map(render_frame, range(total_frames), chunksize=8)
+            ):
+                out.write(numpy_array)
+                if frame % 30 == 0:
+                    print(f"  Frame {{frame}}/{{total_frames}} ({{frame / total_frames * 100:.1f}}%)")
+    finally:
+        out.release()
+
+    print(f"Video saved to: {output_path_fixed}")
+    print("Simulation complete!")
+'''
 
-print("Writing video file...")
-# Use H.264 codec for better compatibility with mobile devices
-fourcc = cv2.VideoWriter_fourcc(*'avc1')  # H.264 codec
-out = cv2.VideoWriter("{output_path_fixed}", fourcc, fps, (width, height))
+        return script
 
-for frame in temp_frames:
-    out.write(frame)
+    _RENDER_CACHE_MAX = 32
 
-out.release()
+    @staticmethod
+    def _link_or_copy(src: str, dst: str):
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            # Cross-device filesystems cannot hard-link
+            shutil.copyfile(src, dst)
+
+    def _trim_render_cache(self):
+        entries = [
+            os.path.join(self._render_cache_dir, name)
+            for name in os.listdir(self._render_cache_dir)
+        ]
+        if len(entries) <= self._RENDER_CACHE_MAX:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self._RENDER_CACHE_MAX]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _render_cache_key(self, script_file: str, output_path: str) -> str:
+        """Key a render by what actually determines its pixels: the script
+        with the per-request output path masked out (every request gets a
+        unique sim id, so hashing it would make hits impossible), plus the
+        simulation_data.json contents the script reads its scene from."""
+        with open(script_file, "rb") as f:
+            script_bytes = f.read().replace(
+                output_path.replace("\\", "/").encode(), b"{output_path}"
+            )
+        hasher = hashlib.blake2b(script_bytes, digest_size=16)
 
-print(f"Video saved to: {output_path_fixed}")
-print("Simulation complete!")
-'''
+        data_file = os.path.join(self.temp_dir, "simulation_data.json")
+        try:
+            with open(data_file, "rb") as f:
+                hasher.update(f.read())
+        except FileNotFoundError:
+            pass
 
-        return script
+        return hasher.hexdigest()
 
     async def _run_paraview(self, script_file: str, output_path: str) -> str:
-        """Run ParaView/VTK script"""
+        """Run ParaView/VTK script, memoized by scene fingerprint.
+
+        Identical simulations (same building, damage and instructions)
+        resolve to a hard link of the cached video instead of minutes of
+        VTK; the per-key lock coalesces concurrent identical requests
+        into one render."""
+        key = self._render_cache_key(script_file, output_path)
+        cache_path = os.path.join(self._render_cache_dir, f"{key}.mp4")
+
+        lock = self._render_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if os.path.exists(cache_path):
+                logger.info(f"Render cache hit for key {key[:12]}")
+                await asyncio.to_thread(self._link_or_copy, cache_path, output_path)
+                return output_path
+
+            result = await self._run_paraview_uncached(script_file, output_path)
+            await asyncio.to_thread(self._link_or_copy, output_path, cache_path)
+            self._trim_render_cache()
+            return result
+
+    async def _run_paraview_uncached(self, script_file: str, output_path: str) -> str:
+        """Run ParaView/VTK script on a persistent render worker"""
 
         try:
             logger.info(f"Running VTK simulation script...")
             logger.info(f"Script: {script_file}")
             logger.info(f"Output: {output_path}")
 
-            cmd = ["python", script_file]
-
-            logger.info(f"Command: {' '.join(cmd)}")
-
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  
-            )
-
-
-            if result.stdout:
-                logger.info(f"VTK stdout: {result.stdout[-1000:]}")
-            if result.stderr:
-                logger.warning(f"VTK stderr: {result.stderr[-1000:]}")
+            if self._worker_pool is None:
+                self._worker_pool = VTKWorkerPool()
 
-            if result.returncode != 0:
-                raise Exception(f"VTK rendering failed with code {result.returncode}")
+            # The pool call blocks until a worker frees up, so keep it
+            # off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._worker_pool.run, script_file)
 
-
-            if not os.path.exists(output_path):
+            # One stat covers both the existence check and the size
+            try:
+                file_size = os.stat(output_path).st_size
+            except FileNotFoundError:
                 raise Exception(f"Output video file not created: {output_path}")
 
-            file_size = os.path.getsize(output_path)
             logger.info(f"ParaView/VTK rendering complete: {output_path} ({file_size / 1024:.1f} KB)")
 
             return output_path
@@ -861,23 +1273,29 @@ print("Simulation complete!")
             logger.info("Testing VTK installation...")
             import vtk
 
-
-            renderer = vtk.vtkRenderer()
-            render_window = vtk.vtkRenderWindow()
-            render_window.AddRenderer(renderer)
-            render_window.SetSize(640, 480)
-            render_window.SetOffScreenRendering(1)
-
-
-            cube = vtk.vtkCubeSource()
-            mapper = vtk.vtkPolyDataMapper()
-            mapper.SetInputConnection(cube.GetOutputPort())
-            actor = vtk.vtkActor()
-            actor.SetMapper(mapper)
-            renderer.AddActor(actor)
-
-
-            render_window.Render()
+            # Build the offscreen pipeline once and keep it; a GL context
+            # and driver allocations per health check add up fast
+            if self._test_pipeline is None:
+                renderer = vtk.vtkRenderer()
+                # Same EGL preference as the render workers
+                if hasattr(vtk, "vtkEGLRenderWindow"):
+                    render_window = vtk.vtkEGLRenderWindow()
+                else:
+                    render_window = vtk.vtkRenderWindow()
+                render_window.AddRenderer(renderer)
+                render_window.SetSize(640, 480)
+                render_window.SetOffScreenRendering(1)
+
+                cube = vtk.vtkCubeSource()
+                mapper = vtk.vtkPolyDataMapper()
+                mapper.SetInputConnection(cube.GetOutputPort())
+                actor = vtk.vtkActor()
+                actor.SetMapper(mapper)
+                renderer.AddActor(actor)
+
+                self._test_pipeline = (renderer, render_window, cube, mapper, actor)
+
+            self._test_pipeline[1].Render()
 
             logger.info("✅ VTK test passed!")
             return True
@@ -401,17 +401,21 @@ class PhysicsSimulationService:
     def _apply_damage_to_structure(self, components: List, annotations: List[Dict]):
 
         logger.info(f"Applying damage from {len(annotations)} annotations")
-        
+
+        # Component positions do not move while damage is applied, so one
+        # capture serves every annotation's distance filter
+        pos_xy = self._cache_positions(components)
+
         for annotation in annotations:
             issue_type = annotation.get("issueType", "")
             position = annotation.get("position", {})
             x = position.get("x", 0)
             y = position.get("y", 0)
-            
+
             logger.info(f"Applying {issue_type} damage at coordinates ({x}, {y})")
-            
 
-            affected_components = self._find_components_near_coordinates(components, x, y)
+
+            affected_components = self._find_components_near_coordinates(components, x, y, pos_xy=pos_xy)
             
             if issue_type == "crack":
 
@@ -455,18 +459,32 @@ class PhysicsSimulationService:
                         component.SetMass(component.GetMass() * 0.5)  # 50% reduction
                         logger.info(f"Wall damage to {component.GetName()}")
     
-    def _find_components_near_coordinates(self, components: List, x: float, y: float, radius: float = 5.0) -> List:
-
-        affected = []
-        
-        for component in components:
+    @staticmethod
+    def _cache_positions(components: List) -> np.ndarray:
+        """Capture component XY positions as one (N, 2) array so distance
+        filters run as a vectorized pass instead of a GetPos() loop."""
+        pos_xy = np.empty((len(components), 2), dtype=np.float64)
+        for k, component in enumerate(components):
             pos = component.GetPos()
-            distance = ((pos.x - x) ** 2 + (pos.y - y) ** 2) ** 0.5
-            
-            if distance <= radius:
-                affected.append(component)
-                logger.info(f"Component {component.GetName()} affected (distance: {distance:.2f}m)")
-        
+            pos_xy[k, 0] = pos.x
+            pos_xy[k, 1] = pos.y
+        return pos_xy
+
+    def _find_components_near_coordinates(
+        self, components: List, x: float, y: float, radius: float = 5.0,
+        pos_xy: Optional[np.ndarray] = None
+    ) -> List:
+
+        if pos_xy is None:
+            pos_xy = self._cache_positions(components)
+
+        d2 = (pos_xy[:, 0] - x) ** 2 + (pos_xy[:, 1] - y) ** 2
+        indices = np.where(d2 <= radius * radius)[0]
+
+        affected = [components[i] for i in indices]
+        for i, component in zip(indices, affected):
+            logger.info(f"Component {component.GetName()} affected (distance: {d2[i] ** 0.5:.2f}m)")
+
         return affected
     
     def _run_chrono_simulation(self, system, components: List) -> Dict:
@@ -474,32 +492,41 @@ class PhysicsSimulationService:
         simulation_time = 10.0  # seconds
         time_step = 0.01
         steps = int(simulation_time / time_step)
-        
-        collapse_sequence = []
-        debris_pattern = []
-        
+
+        # Positions go into one preallocated (steps, N, 3) array so the
+        # step loop only reads GetPos() - no per-step Python lists and no
+        # GC churn while the solver runs
+        positions = np.empty((steps, len(components), 3), dtype=np.float32)
+
         for step in range(steps):
-            time = step * time_step
             system.DoStepDynamics(time_step)
-            
 
-            positions = []
-            for component in components:
+            row = positions[step]
+            for k, component in enumerate(components):
                 pos = component.GetPos()
-                positions.append([pos.x, pos.y, pos.z])
-            
-            collapse_sequence.append({
-                "time": time,
-                "positions": positions
-            })
-
-            if time > 5.0:  # Simplified collapse detection
-                debris_pattern.append({
-                    "time": time,
-                    "debris_count": len(components),
-                    "impact_zone": {"x": 0, "y": 0, "radius": 10}
-                })
-        
+                row[k, 0] = pos.x
+                row[k, 1] = pos.y
+                row[k, 2] = pos.z
+
+        times = np.arange(steps) * time_step
+
+        # The response schema still wants per-step dicts; one bulk
+        # tolist() builds them far cheaper than steps x N appends
+        collapse_sequence = [
+            {"time": t, "positions": p}
+            for t, p in zip(times.tolist(), positions.tolist())
+        ]
+
+        # Simplified collapse detection
+        debris_pattern = [
+            {
+                "time": t,
+                "debris_count": len(components),
+                "impact_zone": {"x": 0, "y": 0, "radius": 10}
+            }
+            for t in times[times > 5.0].tolist()
+        ]
+
         return {
             "collapse_sequence": collapse_sequence,
             "failure_time": 5.0,
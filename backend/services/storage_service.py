@@ -1,3 +1,4 @@
+import asyncio
 import os
 import boto3
 from botocore.client import Config
@@ -7,6 +8,9 @@ import uuid
 
 
 class StorageService:
+
+    CHUNK_SIZE = 1024 * 1024
+
     def __init__(self):
         self.bucket = os.getenv("S3_BUCKET_NAME")
         self.region = os.getenv("AWS_REGION", "us-east-1")
@@ -29,21 +33,26 @@ class StorageService:
 
         if self.use_s3:
 
-            body = await file.read()
-            self.s3.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=body,
-                ContentType=file.content_type or 'application/octet-stream',
-                ACL='public-read'
+            # upload_fileobj streams from the spooled file in parts instead
+            # of buffering the whole body in memory; boto3 is synchronous,
+            # so run it in a thread or gathered uploads never overlap
+            await asyncio.to_thread(
+                self.s3.upload_fileobj,
+                file.file,
+                self.bucket,
+                key,
+                ExtraArgs={
+                    'ContentType': file.content_type or 'application/octet-stream',
+                    'ACL': 'public-read'
+                }
             )
             return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
         else:
 
             path = os.path.join("./.local_uploads", key.replace("/", "_"))
-            content = await file.read()
             with open(path, 'wb') as f:
-                f.write(content)
+                while chunk := await file.read(self.CHUNK_SIZE):
+                    f.write(chunk)
             return f"/static/{os.path.basename(path)}"
 
 